@@ -1,10 +1,33 @@
 """Database models for MongoDB collections"""
+import os
 from datetime import datetime
-from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List, Dict, Any
+import numpy as np
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer, TypeAdapter
+from pydantic.dataclasses import dataclass as pydantic_dataclass
 from enum import Enum
 
 
+# Series payloads come in as (possibly long) JSON float lists; convert them to
+# a float32 ndarray up front instead of letting pydantic coerce every element
+# to a Python float, and serialize back to a list only at the JSON boundary.
+def _to_float32_array(v):
+    if v is None or isinstance(v, np.ndarray):
+        return v
+    if isinstance(v, (list, tuple)):
+        # fromiter with an explicit count allocates the output exactly once
+        # and skips dtype inference over the Python objects
+        return np.fromiter(v, dtype=np.float32, count=len(v))
+    return np.asarray(v, dtype=np.float32)
+
+
+NumpySeries = Annotated[
+    np.ndarray,
+    BeforeValidator(_to_float32_array),
+    PlainSerializer(lambda a: a.tolist(), return_type=list),
+]
+
+
 class ModelType(str, Enum):
     """Available forecasting models"""
     AUTO = "auto"
@@ -23,8 +46,14 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
-class SalesDataPoint(BaseModel):
-    """Single sales data point"""
+@pydantic_dataclass(config=ConfigDict(extra='ignore'), slots=True)
+class SalesDataPoint:
+    """Single sales data point
+
+    Slotted dataclass rather than a full BaseModel: one of these exists per
+    uploaded row, so skipping the per-instance __dict__ and unknown-field
+    validation matters for large datasets.
+    """
     date: str
     sales_value: float
     region: Optional[str] = None
@@ -37,6 +66,11 @@ class SalesDataPoint(BaseModel):
     description: Optional[str] = None
 
 
+# Bulk validator for ingesting whole uploads in one pydantic-core call
+# (much faster than constructing SalesDataPoint row by row)
+SalesDataPointList = TypeAdapter(List[SalesDataPoint])
+
+
 class SalesDataset(BaseModel):
     """Sales dataset stored in MongoDB"""
     id: str = Field(alias="_id")
@@ -52,12 +86,19 @@ class SalesDataset(BaseModel):
 
 class ForecastRequest(BaseModel):
     """Request for demand forecasting"""
-    data: Optional[List[float]] = None
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    data: Optional[NumpySeries] = None
     dataset_id: Optional[str] = None
     model: ModelType = ModelType.AUTO
     horizon: int = 7
     confidence_level: float = 0.95
     use_claude: bool = False
+    # LLM explanation adds seconds of latency; programmatic clients can opt
+    # out per request, or set DEFAULT_EXPLAIN=false deployment-wide
+    explain: bool = Field(
+        default_factory=lambda: os.getenv("DEFAULT_EXPLAIN", "true").lower() != "false"
+    )
 
 
 class ForecastResult(BaseModel):
@@ -1,28 +1,30 @@
 """Data management API routes"""
-from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, BackgroundTasks
+from fastapi.responses import ORJSONResponse
 from typing import Dict, Any, List
 import pandas as pd
-import io
-import json
 import uuid
 from datetime import datetime
 import numpy as np
 
-from services.training_service import TrainingService
+from services.training_service import TrainingService, get_training_service
 
-router = APIRouter(prefix="/api/data", tags=["data"])
-
-# Initialize service
-training_service = TrainingService()
+router = APIRouter(prefix="/api/data", tags=["data"],
+                   default_response_class=ORJSONResponse)
 
 # In-memory storage for uploaded datasets (in production, use MongoDB)
 datasets_store = {}
 
+# Precomputed listing payload, kept in sync on upload/delete so
+# GET /datasets doesn't rebuild N summary dicts per request
+datasets_summary_cache: List[Dict[str, Any]] = []
+
 
 @router.post("/upload")
-async def upload_data(file: UploadFile = File(...), 
+async def upload_data(file: UploadFile = File(...),
                      auto_train: bool = True,
-                     background_tasks: BackgroundTasks = None) -> Dict[str, Any]:
+                     background_tasks: BackgroundTasks = None,
+                     training_service: TrainingService = Depends(get_training_service)) -> Dict[str, Any]:
     """
     Upload sales data (CSV or JSON) and optionally trigger auto-retraining
     
@@ -30,15 +32,18 @@ async def upload_data(file: UploadFile = File(...),
     - **auto_train**: Automatically retrain models on upload (default: True)
     """
     try:
-        # Read file content
-        contents = await file.read()
-        
-        # Determine file type and parse
+        # Parse straight from the upload's spooled temp file instead of
+        # buffering the whole payload in memory first
         if file.filename.endswith('.csv'):
-            df = pd.read_csv(io.BytesIO(contents))
+            try:
+                df = pd.read_csv(file.file, usecols=['sales_value'],
+                                 dtype={'sales_value': 'float32'}, engine='c')
+            except ValueError:
+                # No sales_value column - fall back to a full parse
+                file.file.seek(0)
+                df = pd.read_csv(file.file)
         elif file.filename.endswith('.json'):
-            data = json.loads(contents)
-            df = pd.DataFrame(data)
+            df = pd.read_json(file.file, orient='records')
         else:
             raise HTTPException(status_code=400, detail="Unsupported file format. Use CSV or JSON.")
         
@@ -57,15 +62,22 @@ async def upload_data(file: UploadFile = File(...),
         # Generate dataset ID
         dataset_id = str(uuid.uuid4())
         
-        # Store dataset
+        # Store dataset (keep the ndarray - ~8 B/value vs ~28 B as Python floats;
+        # convert to list only at the API boundary)
         datasets_store[dataset_id] = {
             "id": dataset_id,
             "name": file.filename,
-            "data": sales_data.tolist(),
+            "data": sales_data,
             "uploaded_at": datetime.utcnow().isoformat(),
             "record_count": len(sales_data)
         }
-        
+        datasets_summary_cache.append({
+            "id": dataset_id,
+            "name": file.filename,
+            "record_count": len(sales_data),
+            "uploaded_at": datasets_store[dataset_id]["uploaded_at"]
+        })
+
         response = {
             "success": True,
             "dataset_id": dataset_id,
@@ -93,20 +105,10 @@ async def list_datasets() -> Dict[str, Any]:
     """
     List all uploaded datasets
     """
-    datasets = [
-        {
-            "id": ds["id"],
-            "name": ds["name"],
-            "record_count": ds["record_count"],
-            "uploaded_at": ds["uploaded_at"]
-        }
-        for ds in datasets_store.values()
-    ]
-    
     return {
         "success": True,
-        "datasets": datasets,
-        "total_count": len(datasets)
+        "datasets": datasets_summary_cache,
+        "total_count": len(datasets_summary_cache)
     }
 
 
@@ -117,10 +119,11 @@ async def get_dataset(dataset_id: str) -> Dict[str, Any]:
     """
     if dataset_id not in datasets_store:
         raise HTTPException(status_code=404, detail="Dataset not found")
-    
+
+    dataset = datasets_store[dataset_id]
     return {
         "success": True,
-        "dataset": datasets_store[dataset_id]
+        "dataset": {**dataset, "data": dataset["data"].tolist()}
     }
 
 
@@ -133,7 +136,8 @@ async def delete_dataset(dataset_id: str) -> Dict[str, Any]:
         raise HTTPException(status_code=404, detail="Dataset not found")
     
     del datasets_store[dataset_id]
-    
+    datasets_summary_cache[:] = [s for s in datasets_summary_cache if s["id"] != dataset_id]
+
     return {
         "success": True,
         "message": "Dataset deleted successfully"
@@ -141,7 +145,8 @@ async def delete_dataset(dataset_id: str) -> Dict[str, Any]:
 
 
 @router.post("/train")
-async def trigger_training(dataset_id: str = None, data: List[float] = None) -> Dict[str, Any]:
+async def trigger_training(dataset_id: str = None, data: List[float] = None,
+                           training_service: TrainingService = Depends(get_training_service)) -> Dict[str, Any]:
     """
     Manually trigger model training
     
@@ -153,7 +158,7 @@ async def trigger_training(dataset_id: str = None, data: List[float] = None) ->
         if dataset_id:
             if dataset_id not in datasets_store:
                 raise HTTPException(status_code=404, detail="Dataset not found")
-            train_data = np.array(datasets_store[dataset_id]["data"])
+            train_data = datasets_store[dataset_id]["data"]
         elif data:
             train_data = np.array(data)
         else:
@@ -179,7 +184,8 @@ async def trigger_training(dataset_id: str = None, data: List[float] = None) ->
 
 
 @router.get("/train/status/{job_id}")
-async def get_training_status(job_id: str) -> Dict[str, Any]:
+async def get_training_status(job_id: str,
+                              training_service: TrainingService = Depends(get_training_service)) -> Dict[str, Any]:
     """
     Get status of a training job
     """
@@ -205,21 +211,26 @@ async def get_statistics() -> Dict[str, Any]:
             }
         
         total_records = sum(ds["record_count"] for ds in datasets_store.values())
-        
-        # Calculate aggregate statistics
-        all_data = []
-        for ds in datasets_store.values():
-            all_data.extend(ds["data"])
-        
-        if all_data:
+
+        # Calculate aggregate statistics over one concatenated array
+        all_data = np.concatenate([ds["data"] for ds in datasets_store.values()])
+
+        if all_data.size:
+            # Derive mean/std from one dot-product pass instead of letting
+            # np.std re-traverse the array with centered temporaries
+            n = all_data.size
+            mean = float(all_data.sum() / n)
+            second_moment = float(np.dot(all_data, all_data) / n)
+            std = float(np.sqrt(max(second_moment - mean * mean, 0.0)))
+
             stats = {
                 "success": True,
                 "total_datasets": len(datasets_store),
                 "total_records": total_records,
-                "min_value": float(min(all_data)),
-                "max_value": float(max(all_data)),
-                "mean_value": float(np.mean(all_data)),
-                "std_value": float(np.std(all_data))
+                "min_value": float(all_data.min()),
+                "max_value": float(all_data.max()),
+                "mean_value": mean,
+                "std_value": std
             }
         else:
             stats = {
@@ -1,24 +1,41 @@
 """Forecast API routes"""
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from typing import Dict, Any
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Tuple
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 import numpy as np
+import orjson
 
 from models.db_models import (
-    ForecastRequest, 
-    LotSizingRequest, 
-    ProductionScheduleRequest, 
+    ForecastRequest,
+    LotSizingRequest,
+    ProductionScheduleRequest,
     MaterialsRequest
 )
-from services.forecast_service import ForecastService
+from services.forecast_service import ForecastService, get_forecast_service
+
+router = APIRouter(prefix="/api/forecast", tags=["forecast"],
+                   default_response_class=ORJSONResponse)
 
-router = APIRouter(prefix="/api/forecast", tags=["forecast"])
+# Content-addressed response cache: identical requests within the TTL get
+# the already-serialized bytes back, skipping the train/predict/LLM pipeline
+# and response re-serialization entirely (deterministic input -> same output)
+_forecast_cache: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+_FORECAST_CACHE_TTL = 300.0
+_FORECAST_CACHE_SIZE = 64
 
-# Initialize service
-forecast_service = ForecastService()
+
+def _forecast_cache_key(request) -> str:
+    payload = orjson.dumps(request.model_dump(), option=orjson.OPT_SERIALIZE_NUMPY)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
 
 
 @router.post("/demand")
-async def forecast_demand(request: ForecastRequest) -> Dict[str, Any]:
+async def forecast_demand(request: ForecastRequest,
+                          forecast_service: ForecastService = Depends(get_forecast_service)) -> Dict[str, Any]:
     """
     Generate demand forecast using ensemble models with auto-selection
     
@@ -27,19 +44,52 @@ async def forecast_demand(request: ForecastRequest) -> Dict[str, Any]:
     - **horizon**: Number of periods to forecast (default: 7)
     - **confidence_level**: Confidence level for intervals (default: 0.95)
     - **use_claude**: Use Claude for explanation (default: False, uses Ollama)
+    - **explain**: Generate LLM explanation/risk text (default: True, or DEFAULT_EXPLAIN env)
     """
     try:
-        result = forecast_service.forecast_demand(request)
-        
+        cache_key = _forecast_cache_key(request)
+        cached = _forecast_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _FORECAST_CACHE_TTL:
+            _forecast_cache.move_to_end(cache_key)
+            return Response(content=cached[1], media_type="application/json")
+
+        result = await forecast_service.forecast_demand(request)
+
         if not result.get("success", False):
             raise HTTPException(status_code=400, detail=result.get("error", "Forecast failed"))
-        
-        return result
-    
+
+        body = orjson.dumps(result)
+        _forecast_cache[cache_key] = (time.monotonic(), body)
+        while len(_forecast_cache) > _FORECAST_CACHE_SIZE:
+            _forecast_cache.popitem(last=False)
+
+        return Response(content=body, media_type="application/json")
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/explain/stream")
+async def stream_forecast_explanation(forecast_data: Dict[str, Any],
+                                      forecast_service: ForecastService = Depends(get_forecast_service)):
+    """
+    Stream an LLM explanation of a forecast as it is generated (Ollama only)
+
+    - **forecast_data**: Forecast result payload (predictions, model_used, metrics, confidence_intervals)
+
+    Chunked text stream; clients see the first tokens in ~100ms instead of
+    waiting for the full completion.
+    """
+    llm = forecast_service.llm_service
+    if not llm.ollama_available:
+        raise HTTPException(status_code=503, detail="Ollama not available for streaming")
+
+    return StreamingResponse(llm.stream_explanation(forecast_data),
+                             media_type="text/event-stream")
+
+
 @router.post("/lot-sizing")
 async def calculate_lot_sizing(request: LotSizingRequest) -> Dict[str, Any]:
     """
@@ -48,9 +98,10 @@ async def calculate_lot_sizing(request: LotSizingRequest) -> Dict[str, Any]:
     Uses EOQ (Economic Order Quantity) and Wagner-Whitin Algorithm
     """
     # STUB implementation
-    total_demand = sum(request.demand_forecast)
-    avg_demand = total_demand / len(request.demand_forecast)
-    
+    demand = np.asarray(request.demand_forecast, dtype=np.float32)
+    total_demand = float(demand.sum())
+    avg_demand = total_demand / demand.size
+
     # Simple EOQ calculation
     eoq = np.sqrt((2 * total_demand * request.ordering_cost) / request.holding_cost)
     
@@ -74,18 +125,18 @@ async def optimize_production_schedule(request: ProductionScheduleRequest) -> Di
     Uses MHP (Material Handling Planning) and Genetic Algorithm
     """
     # STUB implementation
-    total_demand = sum(request.demand_forecast)
-    
-    # Simple schedule: distribute evenly
-    schedule = [min(request.capacity, d) for d in request.demand_forecast]
-    utilization = (sum(schedule) / (request.capacity * len(schedule))) * 100
-    
+    demand = np.asarray(request.demand_forecast, dtype=np.float32)
+
+    # Simple schedule: cap demand at capacity, all vectorized
+    schedule = np.minimum(demand, request.capacity)
+    utilization = (schedule.sum() / (request.capacity * schedule.size)) * 100
+
     return {
         "success": True,
         "method": "MHP",
-        "production_schedule": schedule,
+        "production_schedule": schedule.tolist(),
         "capacity_utilization": float(utilization),
-        "total_production": float(sum(schedule)),
+        "total_production": float(schedule.sum()),
         "capacity": request.capacity,
         "note": "STUB: Full MHP and Genetic Algorithm implementation coming in v2"
     }
@@ -99,19 +150,24 @@ async def plan_materials_acquisition(request: MaterialsRequest) -> Dict[str, Any
     Uses Regression Analysis and MRP (Material Requirements Planning)
     """
     # STUB implementation
-    total_production = sum(request.production_schedule)
-    
-    # Simple MRP: add safety stock and lead time buffer
-    materials_needed = [p + request.safety_stock for p in request.production_schedule]
-    
+    production = np.asarray(request.production_schedule, dtype=np.float32)
+    total_production = float(production.sum())
+
+    # Simple MRP: add safety stock and lead time buffer, all vectorized
+    materials_needed = production + request.safety_stock
+
     # Account for lead time
-    order_schedule = [0] * request.lead_time + materials_needed[:-request.lead_time]
-    
+    lead = request.lead_time
+    order_schedule = np.concatenate([
+        np.zeros(lead, dtype=np.float32),
+        materials_needed[:-lead] if lead else materials_needed
+    ])
+
     return {
         "success": True,
         "method": "MRP",
-        "materials_schedule": materials_needed,
-        "order_schedule": order_schedule,
+        "materials_schedule": materials_needed.tolist(),
+        "order_schedule": order_schedule.tolist(),
         "total_materials": float(total_production + request.safety_stock * len(materials_needed)),
         "lead_time_days": request.lead_time,
         "safety_stock": request.safety_stock,
@@ -119,25 +175,35 @@ async def plan_materials_acquisition(request: MaterialsRequest) -> Dict[str, Any
     }
 
 
+# Status payload cache keyed by the loaded flag, so dashboard polling
+# doesn't rebuild the same dict every request (self-invalidates when the
+# pre-trained models finish loading)
+_models_status_cache: Dict[bool, Dict[str, Any]] = {}
+
+
 @router.get("/models/status")
-async def get_models_status() -> Dict[str, Any]:
+async def get_models_status(forecast_service: ForecastService = Depends(get_forecast_service)) -> Dict[str, Any]:
     """
     Get status of all forecasting models
     """
     try:
-        models_available = {
-            "lstm": forecast_service.models.models_loaded,
-            "arima": True,  # statsmodels always available
-            "xgboost": True,
-            "lightgbm": True,
-            "prophet": True
-        }
-        
-        return {
-            "success": True,
-            "models_available": models_available,
-            "pretrained_loaded": forecast_service.models.models_loaded,
-            "auto_selection_enabled": True
-        }
+        loaded = forecast_service.models.models_loaded
+        status = _models_status_cache.get(loaded)
+        if status is None:
+            status = {
+                "success": True,
+                "models_available": {
+                    "lstm": loaded,
+                    "arima": True,  # statsmodels always available
+                    "xgboost": True,
+                    "lightgbm": True,
+                    "prophet": True
+                },
+                "pretrained_loaded": loaded,
+                "auto_selection_enabled": True
+            }
+            _models_status_cache[loaded] = status
+
+        return status
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
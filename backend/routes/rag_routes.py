@@ -1,18 +1,19 @@
 """RAG query API routes"""
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from typing import Dict, Any
+import orjson
 
 from models.db_models import RAGQueryRequest
-from services.rag_service import RAGService
+from services.rag_service import RAGService, get_rag_service
 
-router = APIRouter(prefix="/api/rag", tags=["rag"])
-
-# Initialize service
-rag_service = RAGService()
+router = APIRouter(prefix="/api/rag", tags=["rag"],
+                   default_response_class=ORJSONResponse)
 
 
 @router.post("/query")
-async def query_knowledge_base(request: RAGQueryRequest) -> Dict[str, Any]:
+async def query_knowledge_base(request: RAGQueryRequest,
+                               rag_service: RAGService = Depends(get_rag_service)) -> Dict[str, Any]:
     """
     Query the knowledge base using RAG
     
@@ -23,7 +24,7 @@ async def query_knowledge_base(request: RAGQueryRequest) -> Dict[str, Any]:
     - **category_filter**: Optional category filter
     """
     try:
-        result = rag_service.query(
+        result = await rag_service.query(
             question=request.question,
             use_claude=request.use_claude,
             top_k=request.top_k,
@@ -40,8 +41,31 @@ async def query_knowledge_base(request: RAGQueryRequest) -> Dict[str, Any]:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/query/stream")
+async def query_knowledge_base_stream(request: RAGQueryRequest,
+                                      rag_service: RAGService = Depends(get_rag_service)):
+    """
+    Query the knowledge base with a streamed (SSE) answer
+
+    Emits a sources event right after retrieval, then token events as the
+    LLM generates, then a done event. Ollama only - Claude requests should
+    use the non-streaming /query endpoint.
+    """
+    async def event_stream():
+        async for event in rag_service.query_stream(
+            question=request.question,
+            top_k=request.top_k,
+            region_filter=request.region_filter,
+            category_filter=request.category_filter
+        ):
+            yield b"data: " + orjson.dumps(event) + b"\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.post("/explain-forecast")
-async def explain_forecast(forecast_data: Dict[str, Any], use_claude: bool = False) -> Dict[str, Any]:
+async def explain_forecast(forecast_data: Dict[str, Any], use_claude: bool = False,
+                           rag_service: RAGService = Depends(get_rag_service)) -> Dict[str, Any]:
     """
     Explain forecast using historical context from RAG
     
@@ -49,7 +73,7 @@ async def explain_forecast(forecast_data: Dict[str, Any], use_claude: bool = Fal
     - **use_claude**: Use Claude for explanation (default: False)
     """
     try:
-        result = rag_service.explain_forecast_with_context(forecast_data, use_claude)
+        result = await rag_service.explain_forecast_with_context(forecast_data, use_claude)
         
         if not result.get("success"):
             raise HTTPException(status_code=400, detail=result.get("error", "Explanation failed"))
@@ -61,7 +85,7 @@ async def explain_forecast(forecast_data: Dict[str, Any], use_claude: bool = Fal
 
 
 @router.get("/knowledge-base/stats")
-async def get_knowledge_base_stats() -> Dict[str, Any]:
+async def get_knowledge_base_stats(rag_service: RAGService = Depends(get_rag_service)) -> Dict[str, Any]:
     """
     Get statistics about the knowledge base
     """
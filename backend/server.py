@@ -4,8 +4,10 @@ Time Series Forecasting with AI Integration
 """
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
+import logging
 import os
 from dotenv import load_dotenv
 import uvicorn
@@ -13,6 +15,11 @@ import uvicorn
 # Load environment variables (don't override Kubernetes env vars)
 load_dotenv(override=False)
 
+# Service/hot-path status messages go through logging (deferred
+# %-formatting, silenceable for benchmarks); INFO keeps the familiar
+# startup output, production can set LOG_LEVEL=WARNING
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+
 # Import routes
 from routes.forecast_routes import router as forecast_router
 from routes.data_routes import router as data_router
@@ -37,11 +44,28 @@ async def lifespan(app: FastAPI):
     print(f"🧠 Claude: {'✓ Configured' if has_claude else '✗ Not configured'}")
     print(f"💾 Storage: In-memory (MongoDB optional)")
     print("=" * 60)
-    
+
+    # Build the service singletons up front so pre-trained models are loaded
+    # before traffic arrives (and shared copy-on-write by forked workers)
+    from services.forecast_service import get_forecast_service
+    from services.training_service import get_training_service
+    from services.rag_service import get_rag_service
+    get_forecast_service().warmup()
+    get_training_service()
+    get_rag_service()
+
+    # Warm the pooled LLM connections in the background (1-token Ollama
+    # probe + Claude TLS handshake) without delaying readiness
+    from services.llm_service import get_llm_service
+    asyncio.create_task(get_llm_service().warmup())
+
     yield
-    
+
     # Shutdown
     print("\n👋 ChronoForge Pulse Backend Shutting Down...")
+    # Drain the pooled LLM connections (one shared client for all services)
+    from services.llm_service import get_llm_service
+    await get_llm_service().aclose()
 
 
 # Create FastAPI app
@@ -49,7 +73,8 @@ app = FastAPI(
     title="ChronoForge Pulse API",
     description="Time Series Forecasting Backend with AI Integration (Ollama + Claude)",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration - allow production domain
@@ -88,16 +113,14 @@ async def root():
 @app.get("/api/health")
 async def health_check():
     """Health check endpoint"""
-    # Check Ollama
-    ollama_available = False
-    try:
-        import requests
-        ollama_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
-        response = requests.get(f"{ollama_url}/api/tags", timeout=2)
-        ollama_available = response.status_code == 200
-    except:
-        pass
-    
+    # Read the LLM service's TTL-cached Ollama flag instead of re-probing
+    # (the old inline probe blocked the loop for up to 2s per health check)
+    from services.forecast_service import get_forecast_service
+    llm = get_forecast_service().llm_service
+    llm._maybe_refresh_ollama()
+    ollama_available = llm.ollama_available
+
+
     # Check Claude
     claude_available = bool(os.getenv("ANTHROPIC_API_KEY"))
     
@@ -122,7 +145,7 @@ async def health_check():
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "success": False,
@@ -134,10 +157,24 @@ async def global_exception_handler(request, exc):
 
 if __name__ == "__main__":
     port = int(os.getenv("BACKEND_PORT", 8001))
-    uvicorn.run(
-        "server:app",
-        host="0.0.0.0",
-        port=port,
-        reload=True,
-        log_level="info"
-    )
+    if os.getenv("RELOAD", "false").lower() == "true":
+        # Dev mode: auto-reload forces a single worker and the default loop
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=port,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Production: uvloop + httptools (bundled with uvicorn[standard])
+        # and one worker per core up to 4
+        uvicorn.run(
+            "server:app",
+            host="0.0.0.0",
+            port=port,
+            workers=int(os.getenv("WORKERS", str(min(os.cpu_count() or 1, 4)))),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
@@ -1,102 +1,146 @@
 """Forecast service - Core forecasting logic with auto model selection"""
+import asyncio
+import functools
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 import uuid
 
-from models.forecasting_models import ForecastingModels, EnsembleResult
 from models.db_models import ModelType, ForecastRequest
 from utils.model_evaluator import ModelEvaluator
-from services.llm_service import LLMService
+from services.llm_service import get_llm_service
+
+
+@functools.lru_cache(maxsize=1)
+def get_forecast_service() -> "ForecastService":
+    """Process-wide ForecastService singleton for route dependency injection.
+
+    Instantiating lazily (instead of at route-module import) means workers
+    forked after a warm parent share the loaded model pages copy-on-write.
+    """
+    return ForecastService()
 
 
 class ForecastService:
     """Core forecasting service with auto model selection"""
     
     def __init__(self):
+        # Imported here, not at module top: forecasting_models pulls in
+        # TensorFlow/XGBoost/LightGBM/Prophet, which would otherwise load
+        # when the route modules import this file (slow cold starts and
+        # uvicorn reloads). The lifespan warm-up pays this cost once.
+        from models.forecasting_models import ForecastingModels
+
         self.models = ForecastingModels()
         self.evaluator = ModelEvaluator()
-        self.llm_service = LLMService()
-        
+        self.llm_service = get_llm_service()
+
+        # LRU of trained model sets keyed by a content hash of the series,
+        # so re-submitting the same dataset (common during UI exploration)
+        # skips retraining entirely
+        self._train_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._train_cache_size = 32
+
         # Try to load pre-trained models
         self.models.load_pretrained_models()
+
+    def warmup(self):
+        """Pay one-time JIT and lazy-init costs before serving traffic
+
+        First calls into numba kernels, XGBoost/LightGBM predict and the
+        ONNX/tree-dump caches are 10-100x slower than steady state; running
+        a tiny dummy fit/predict here keeps that out of the first request.
+        """
+        try:
+            dummy = np.linspace(1.0, 2.0, 16, dtype=np.float32)
+            self.evaluator.evaluate_model(dummy, dummy)
+            self.evaluator.calculate_confidence_interval(dummy[:4].tolist())
+
+            for name, trainer in (("xgboost", self.models.train_xgboost),
+                                  ("lightgbm", self.models.train_lightgbm)):
+                model = trainer(dummy)
+                if model:
+                    self._predict_model({name: model}, name, dummy, 1)
+
+            print("✓ Warm-up complete (metric kernels and tree predict paths)")
+        except Exception as e:
+            print(f"⚠ Warm-up skipped: {e}")
     
     def train_all_models(self, data: np.ndarray) -> Dict[str, Any]:
-        """Train all available models on the data"""
-        trained_models = {}
-        
+        """Train all available models on the data (in parallel)
+
+        Results are memoized by a content hash of the series, so repeated
+        forecasts over the same dataset reuse the fitted models.
+        """
+        cache_key = hashlib.blake2b(np.ascontiguousarray(data).tobytes(),
+                                    digest_size=16).hexdigest()
+        cached = self._train_cache.get(cache_key)
+        if cached is not None:
+            self._train_cache.move_to_end(cache_key)
+            print(f"✓ Reusing trained models for dataset {cache_key[:8]}")
+            return cached
+
         print(f"Training models on {len(data)} data points...")
-        
-        # SARIMA
-        sarima = self.models.train_sarima(data)
-        if sarima:
-            trained_models["sarima"] = sarima
-            print("✓ SARIMA trained")
-        
-        # LSTM
-        lstm, scaler = self.models.train_lstm(data)
-        if lstm and scaler:
-            trained_models["lstm"] = {"model": lstm, "scaler": scaler}
-            print("✓ LSTM trained")
-        
-        # XGBoost
-        xgb = self.models.train_xgboost(data)
-        if xgb:
-            trained_models["xgboost"] = xgb
-            print("✓ XGBoost trained")
-        
-        # LightGBM
-        lgbm = self.models.train_lightgbm(data)
-        if lgbm:
-            trained_models["lightgbm"] = lgbm
-            print("✓ LightGBM trained")
-        
-        # Prophet
-        prophet = self.models.train_prophet(data)
-        if prophet:
-            trained_models["prophet"] = prophet
-            print("✓ Prophet trained")
-        
+
+        trained_models = self.models.train_all(data)
+
+        for name in trained_models:
+            print(f"✓ {name.upper()} trained")
+
+        if trained_models:
+            self._train_cache[cache_key] = trained_models
+            while len(self._train_cache) > self._train_cache_size:
+                self._train_cache.popitem(last=False)
+
         return trained_models
-    
-    def generate_predictions(self, trained_models: Dict[str, Any], 
-                           recent_data: np.ndarray, horizon: int) -> Dict[str, List[float]]:
-        """Generate predictions from all trained models"""
-        predictions = {}
-        
-        # SARIMA predictions
-        if "sarima" in trained_models:
-            preds = self.models.predict_sarima(trained_models["sarima"], horizon)
-            if preds:
-                predictions["sarima"] = preds
-        
-        # LSTM predictions
-        if "lstm" in trained_models:
+
+    def _predict_model(self, trained_models: Dict[str, Any], name: str,
+                       recent_data: np.ndarray, horizon: int) -> List[float]:
+        """Run inference for one trained model by name"""
+        if name == "sarima":
+            return self.models.predict_sarima(trained_models["sarima"], horizon)
+        if name == "lstm":
             lstm_data = trained_models["lstm"]
-            preds = self.models.predict_lstm(
+            return self.models.predict_lstm(
                 lstm_data["model"], lstm_data["scaler"], recent_data, horizon
             )
-            if preds:
-                predictions["lstm"] = preds
-        
-        # XGBoost predictions
-        if "xgboost" in trained_models:
-            preds = self.models.predict_xgboost(trained_models["xgboost"], recent_data, horizon)
-            if preds:
-                predictions["xgboost"] = preds
-        
-        # LightGBM predictions
-        if "lightgbm" in trained_models:
-            preds = self.models.predict_lightgbm(trained_models["lightgbm"], recent_data, horizon)
-            if preds:
-                predictions["lightgbm"] = preds
-        
-        # Prophet predictions
-        if "prophet" in trained_models:
-            preds = self.models.predict_prophet(trained_models["prophet"], horizon)
-            if preds:
-                predictions["prophet"] = preds
-        
+        if name == "xgboost":
+            return self.models.predict_xgboost(trained_models["xgboost"], recent_data, horizon)
+        if name == "lightgbm":
+            return self.models.predict_lightgbm(trained_models["lightgbm"], recent_data, horizon)
+        if name == "prophet":
+            return self.models.predict_prophet(trained_models["prophet"], horizon)
+        return []
+
+    def generate_predictions(self, trained_models: Dict[str, Any],
+                           recent_data: np.ndarray, horizon: int) -> Dict[str, List[float]]:
+        """Generate predictions from all trained models concurrently
+
+        Like training, inference runs in GIL-releasing native code, so a
+        thread pool brings wall time close to the slowest single model.
+        """
+        predictions = {}
+
+        with ThreadPoolExecutor(max_workers=min(len(trained_models) or 1, os.cpu_count() or 1)) as executor:
+            futures = {
+                executor.submit(self._predict_model, trained_models, name, recent_data, horizon): name
+                for name in trained_models
+            }
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    preds = future.result()
+                except Exception as e:
+                    print(f"{name} prediction error: {e}")
+                    continue
+                if preds:
+                    predictions[name] = preds
+
         return predictions
     
     def evaluate_models(self, predictions: Dict[str, List[float]], 
@@ -116,12 +160,13 @@ class ForecastService:
         
         return results
     
-    def forecast_demand(self, request: ForecastRequest) -> Dict[str, Any]:
+    async def forecast_demand(self, request: ForecastRequest) -> Dict[str, Any]:
         """Main demand forecasting method"""
         try:
-            # Extract data
-            if request.data:
-                data = np.array(request.data)
+            # Extract data (already a float32 ndarray via the request validator);
+            # everything downstream slices views off this one contiguous array
+            if request.data is not None and len(request.data) > 0:
+                data = np.ascontiguousarray(request.data, dtype=np.float32)
             else:
                 raise ValueError("No data provided for forecasting")
             
@@ -130,10 +175,10 @@ class ForecastService:
             
             # If specific model requested (not auto)
             if request.model != ModelType.AUTO:
-                return self._forecast_single_model(data, request)
-            
+                return await self._forecast_single_model(data, request)
+
             # Auto mode: train all models and select best
-            return self._forecast_auto_mode(data, request)
+            return await self._forecast_auto_mode(data, request)
             
         except Exception as e:
             return {
@@ -141,7 +186,7 @@ class ForecastService:
                 "error": str(e)
             }
     
-    def _forecast_single_model(self, data: np.ndarray, request: ForecastRequest) -> Dict[str, Any]:
+    async def _forecast_single_model(self, data: np.ndarray, request: ForecastRequest) -> Dict[str, Any]:
         """Forecast using a single specified model"""
         model_name = request.model.value
         horizon = request.horizon
@@ -184,8 +229,11 @@ class ForecastService:
             "confidence_intervals": confidence_intervals
         }
         
-        llm_explanation = self.llm_service.explain_forecast(forecast_data, request.use_claude)
-        
+        if request.explain:
+            llm_explanation = await self.llm_service.explain_forecast(forecast_data, request.use_claude)
+        else:
+            llm_explanation = ""
+
         return {
             "success": True,
             "forecast_id": str(uuid.uuid4()),
@@ -199,7 +247,7 @@ class ForecastService:
             "created_at": datetime.utcnow().isoformat()
         }
     
-    def _forecast_auto_mode(self, data: np.ndarray, request: ForecastRequest) -> Dict[str, Any]:
+    async def _forecast_auto_mode(self, data: np.ndarray, request: ForecastRequest) -> Dict[str, Any]:
         """Auto mode: train all models and select best based on validation"""
         horizon = request.horizon
         
@@ -228,15 +276,21 @@ class ForecastService:
         best_model_name, best_metrics = self.evaluator.select_best_model(model_results)
         
         print(f"✓ Best model selected: {best_model_name} (MAPE: {best_metrics.get('mape', 0):.2f}%)")
-        
-        # Generate final forecast with best model
-        final_predictions = self.generate_predictions(trained_models, data, horizon)
-        best_predictions = final_predictions.get(best_model_name, [])
-        
+
+        # Generate the final forecast with the best model only; re-running
+        # all five models here roughly doubled auto-mode inference cost
+        best_predictions = self._predict_model(trained_models, best_model_name, data, horizon)
+
         if not best_predictions:
-            # Fallback to any available predictions
-            best_model_name = list(final_predictions.keys())[0]
-            best_predictions = final_predictions[best_model_name]
+            # Fallback: walk the remaining models until one predicts
+            for name in trained_models:
+                if name == best_model_name:
+                    continue
+                preds = self._predict_model(trained_models, name, data, horizon)
+                if preds:
+                    best_model_name = name
+                    best_predictions = preds
+                    break
         
         # Calculate confidence intervals
         confidence_intervals = self.evaluator.calculate_confidence_interval(
@@ -251,9 +305,17 @@ class ForecastService:
             "confidence_intervals": confidence_intervals,
             "all_model_results": model_results
         }
-        
-        llm_explanation = self.llm_service.explain_forecast(forecast_data, request.use_claude)
-        
+
+        # Explanation and risk assessment are independent LLM calls - run them
+        # concurrently so the network waits overlap instead of adding up
+        if request.explain:
+            llm_explanation, risk_assessment = await asyncio.gather(
+                self.llm_service.explain_forecast(forecast_data, request.use_claude),
+                self.llm_service.assess_risk(forecast_data, use_claude=request.use_claude)
+            )
+        else:
+            llm_explanation = risk_assessment = ""
+
         return {
             "success": True,
             "forecast_id": str(uuid.uuid4()),
@@ -261,8 +323,9 @@ class ForecastService:
             "predictions": best_predictions,
             "confidence_intervals": confidence_intervals,
             "metrics": best_metrics,
+            "risk_assessment": risk_assessment,
             "all_model_results": model_results,
-            "model_breakdown": {name: preds for name, preds in final_predictions.items()},
+            "model_breakdown": val_predictions,
             "feature_importance": [],
             "llm_explanation": llm_explanation,
             "llm_used": "claude" if request.use_claude else "ollama",
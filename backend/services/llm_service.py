@@ -1,29 +1,143 @@
 """LLM Service - Routes requests between Ollama (primary) and Claude (secondary)"""
+import asyncio
+import functools
 import os
-import json
-import anthropic
-from typing import Dict, Any, Optional
+import time
+import httpx
+import numpy as np
+import orjson
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 
+def _fmt_preds(preds: List[float]) -> str:
+    """Compact summary of a prediction series for prompt text
+
+    Long horizons would otherwise dump hundreds of floats into the prompt,
+    which is slow to build and burns LLM context without adding signal.
+    """
+    if not preds:
+        return "[]"
+    if len(preds) <= 10:
+        return str([round(float(p), 3) for p in preds])
+    arr = np.asarray(preds, dtype=np.float64)
+    head = [round(float(p), 3) for p in preds[:5]]
+    tail = [round(float(p), 3) for p in preds[-5:]]
+    return (f"n={len(preds)}, head={head}, tail={tail}, "
+            f"mean={arr.mean():.3f}, std={arr.std():.3f}")
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm_service() -> "LLMService":
+    """Process-wide LLMService singleton so all services share one set of
+    pooled HTTP connections (Ollama and Claude)"""
+    return LLMService()
+
+
 class LLMService:
     """Manages LLM inference with intelligent routing"""
-    
+
+    # Prompt templates at class scope so per-request work is substitution only
+    EXPLAIN_PROMPT = """Analyze this demand forecast:
+
+Predictions: {predictions}
+Model Used: {model_used}
+Metrics: {metrics}
+Confidence Intervals: lower {ci_lower}; upper {ci_upper}
+
+Provide a concise explanation of:
+1. What the forecast indicates
+2. Confidence level and reliability
+3. Key insights for decision-making
+"""
+
+    RISK_PROMPT = """Assess risks for this demand forecast:
+
+Predictions: {predictions}
+Model: {model_used}
+Metrics: {metrics}
+
+{historical_context}
+
+Identify:
+1. Potential risks (supply, demand, external factors)
+2. Confidence level concerns
+3. Mitigation strategies
+"""
+
     def __init__(self):
         # Claude setup
         self.anthropic_key = os.getenv("ANTHROPIC_API_KEY")
         self.claude_client = None
+        self._claude_http = None
         if self.anthropic_key:
             try:
-                self.claude_client = anthropic.Anthropic(api_key=self.anthropic_key)
+                # Imported only when a key is configured; the anthropic SDK
+                # adds noticeable import time most deployments never need
+                import anthropic
+
+                # Shared HTTP/2 transport: keep-alive plus multiplexed
+                # streams, and async so Claude calls don't block the loop
+                self._claude_http = httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=16)
+                )
+                self.claude_client = anthropic.AsyncAnthropic(
+                    api_key=self.anthropic_key, http_client=self._claude_http
+                )
                 print("✓ Claude (Anthropic) client initialized")
             except Exception as e:
                 print(f"⚠ Claude initialization failed: {e}")
-        
+
         # Ollama setup
         self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama3")
         self.ollama_available = self._check_ollama()
+
+        # Availability is cached with a TTL and refreshed in the background;
+        # select_llm stays a cheap attribute read instead of an HTTP probe
+        self._ollama_checked_at = time.monotonic()
+        self._ollama_ttl = 30.0
+
+        # Pooled async client: keep-alive connections to Ollama so calls
+        # neither block the event loop nor re-handshake TCP per request
+        self._http = httpx.AsyncClient(
+            base_url=self.ollama_base_url,
+            timeout=60,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+
+    async def aclose(self):
+        """Close the pooled HTTP clients (call from server shutdown)"""
+        await self._http.aclose()
+        if self._claude_http is not None:
+            await self._claude_http.aclose()
+
+    async def warmup(self):
+        """Pre-open pooled connections so the first real query skips them
+
+        A 1-token probe to Ollama both establishes the keep-alive
+        connection and loads the model server-side; for Claude a cheap
+        unauthenticated-looking GET is enough to finish the TCP + TLS
+        handshake that would otherwise land on the first user request.
+        Failures are ignored - this is purely opportunistic.
+        """
+        if self.ollama_available:
+            try:
+                await self._http.post("/api/generate", json={
+                    "model": self.ollama_model,
+                    "prompt": "Hi",
+                    "stream": False,
+                    "options": {"num_predict": 1}
+                }, timeout=15)
+            except Exception:
+                pass
+        if self._claude_http is not None:
+            try:
+                await self._claude_http.get("https://api.anthropic.com/v1/models",
+                                            timeout=5)
+            except Exception:
+                pass
     
     def _check_ollama(self) -> bool:
         """Check if Ollama is available"""
@@ -36,7 +150,31 @@ class LLMService:
         except:
             print(f"⚠ Ollama not available at {self.ollama_base_url}")
         return False
-    
+
+    def _maybe_refresh_ollama(self):
+        """Kick off a background availability refresh once the TTL expires
+
+        Returns the cached flag immediately; the probe runs on the event
+        loop through the pooled client so no request ever waits on it.
+        """
+        if time.monotonic() - self._ollama_checked_at <= self._ollama_ttl:
+            return
+        self._ollama_checked_at = time.monotonic()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # sync caller, no loop to schedule on - keep cached flag
+        asyncio.create_task(self._refresh_ollama_async())
+
+    async def _refresh_ollama_async(self):
+        """Re-probe Ollama and update the cached availability flag"""
+        try:
+            response = await self._http.get("/api/tags", timeout=2)
+            self.ollama_available = response.status_code == 200
+        except Exception:
+            self.ollama_available = False
+
+
     def calculate_complexity_score(self, task_type: str, context_length: int = 0) -> float:
         """Calculate task complexity score (0-1)"""
         complexity_map = {
@@ -59,6 +197,8 @@ class LLMService:
     
     def select_llm(self, task_type: str, use_claude: bool = False, context_length: int = 0) -> str:
         """Select appropriate LLM based on task complexity"""
+        self._maybe_refresh_ollama()
+
         # Force Claude if requested and available
         if use_claude and self.claude_client:
             return "claude"
@@ -81,11 +221,9 @@ class LLMService:
         # No LLM available
         return "none"
     
-    def generate_with_ollama(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
+    async def generate_with_ollama(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
         """Generate response using Ollama"""
         try:
-            import requests
-            
             payload = {
                 "model": self.ollama_model,
                 "prompt": prompt,
@@ -96,13 +234,9 @@ class LLMService:
                     "top_p": 0.9
                 }
             }
-            
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate",
-                json=payload,
-                timeout=60
-            )
-            
+
+            response = await self._http.post("/api/generate", json=payload)
+
             if response.status_code == 200:
                 result = response.json()
                 # Check for errors in response
@@ -128,7 +262,52 @@ class LLMService:
                 "error": f"Ollama error: {str(e)}"
             }
     
-    def generate_with_claude(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
+    async def stream_with_ollama(self, prompt: str, system_prompt: str = ""):
+        """Stream response tokens from Ollama as they are generated
+
+        Async generator over text chunks; time-to-first-token is the model's
+        first-token latency instead of the full generation time.
+        """
+        payload = {
+            "model": self.ollama_model,
+            "prompt": prompt,
+            "system": system_prompt,
+            "stream": True,
+            "options": {
+                "temperature": 0.7,
+                "top_p": 0.9
+            }
+        }
+
+        async with self._http.stream("POST", "/api/generate", json=payload) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("error"):
+                    yield f"[Ollama error: {chunk['error']}]"
+                    return
+                piece = chunk.get("response", "")
+                if piece:
+                    yield piece
+                if chunk.get("done"):
+                    return
+
+    def stream_explanation(self, forecast_data: Dict[str, Any]):
+        """Async generator streaming the forecast explanation text"""
+        ci = forecast_data.get('confidence_intervals', {})
+        prompt = self.EXPLAIN_PROMPT.format(
+            predictions=_fmt_preds(forecast_data.get('predictions', [])),
+            model_used=forecast_data.get('model_used', 'unknown'),
+            metrics=orjson.dumps(forecast_data.get('metrics', {})).decode(),
+            ci_lower=_fmt_preds(ci.get('lower', [])),
+            ci_upper=_fmt_preds(ci.get('upper', []))
+        )
+        system_prompt = """You are a sales forecasting expert. Provide clear, actionable insights
+from forecast data. Be concise and focus on business implications."""
+        return self.stream_with_ollama(prompt, system_prompt)
+
+    async def generate_with_claude(self, prompt: str, system_prompt: str = "") -> Dict[str, Any]:
         """Generate response using Claude"""
         try:
             if not self.claude_client:
@@ -136,8 +315,8 @@ class LLMService:
                     "success": False,
                     "error": "Claude client not initialized"
                 }
-            
-            response = self.claude_client.messages.create(
+
+            response = await self.claude_client.messages.create(
                 model="claude-3-5-sonnet-20240620",
                 max_tokens=1024,
                 temperature=0.7,
@@ -160,21 +339,21 @@ class LLMService:
                 "error": f"Claude error: {str(e)}"
             }
     
-    def generate(self, prompt: str, task_type: str = "simple_query", 
-                 system_prompt: str = "", use_claude: bool = False) -> Dict[str, Any]:
+    async def generate(self, prompt: str, task_type: str = "simple_query",
+                       system_prompt: str = "", use_claude: bool = False) -> Dict[str, Any]:
         """Generate response with automatic LLM routing"""
         context_length = len(prompt)
         selected_llm = self.select_llm(task_type, use_claude, context_length)
-        
+
         if selected_llm == "ollama":
-            result = self.generate_with_ollama(prompt, system_prompt)
+            result = await self.generate_with_ollama(prompt, system_prompt)
             # Fallback to Claude if Ollama fails (e.g., memory issues)
             if not result.get("success") and self.claude_client:
                 print(f"⚠ Ollama failed ({result.get('error')}), falling back to Claude")
-                result = self.generate_with_claude(prompt, system_prompt)
+                result = await self.generate_with_claude(prompt, system_prompt)
                 result["selected_llm"] = "claude (fallback)"
         elif selected_llm == "claude":
-            result = self.generate_with_claude(prompt, system_prompt)
+            result = await self.generate_with_claude(prompt, system_prompt)
         else:
             result = {
                 "success": False,
@@ -186,52 +365,41 @@ class LLMService:
             result["selected_llm"] = selected_llm
         return result
     
-    def explain_forecast(self, forecast_data: Dict[str, Any], use_claude: bool = False) -> str:
+    async def explain_forecast(self, forecast_data: Dict[str, Any], use_claude: bool = False) -> str:
         """Generate forecast explanation"""
-        prompt = f"""Analyze this demand forecast:
-
-Predictions: {forecast_data.get('predictions', [])}
-Model Used: {forecast_data.get('model_used', 'unknown')}
-Metrics: {json.dumps(forecast_data.get('metrics', {}), indent=2)}
-Confidence Intervals: {json.dumps(forecast_data.get('confidence_intervals', {}), indent=2)}
+        ci = forecast_data.get('confidence_intervals', {})
+        prompt = self.EXPLAIN_PROMPT.format(
+            predictions=_fmt_preds(forecast_data.get('predictions', [])),
+            model_used=forecast_data.get('model_used', 'unknown'),
+            metrics=orjson.dumps(forecast_data.get('metrics', {})).decode(),
+            ci_lower=_fmt_preds(ci.get('lower', [])),
+            ci_upper=_fmt_preds(ci.get('upper', []))
+        )
 
-Provide a concise explanation of:
-1. What the forecast indicates
-2. Confidence level and reliability
-3. Key insights for decision-making
-"""
-        
         system_prompt = """You are a sales forecasting expert. Provide clear, actionable insights 
 from forecast data. Be concise and focus on business implications."""
         
-        result = self.generate(prompt, "forecast_explanation", system_prompt, use_claude)
+        result = await self.generate(prompt, "forecast_explanation", system_prompt, use_claude)
         
         if result["success"]:
             return result["text"]
         else:
             return f"Explanation unavailable: {result.get('error', 'Unknown error')}"
     
-    def assess_risk(self, forecast_data: Dict[str, Any], historical_context: str = "", 
-                    use_claude: bool = False) -> str:
+    async def assess_risk(self, forecast_data: Dict[str, Any], historical_context: str = "",
+                          use_claude: bool = False) -> str:
         """Generate risk assessment"""
-        prompt = f"""Assess risks for this demand forecast:
-
-Predictions: {forecast_data.get('predictions', [])}
-Model: {forecast_data.get('model_used', 'unknown')}
-Metrics: {json.dumps(forecast_data.get('metrics', {}))}
-
-{f'Historical Context: {historical_context}' if historical_context else ''}
+        prompt = self.RISK_PROMPT.format(
+            predictions=_fmt_preds(forecast_data.get('predictions', [])),
+            model_used=forecast_data.get('model_used', 'unknown'),
+            metrics=orjson.dumps(forecast_data.get('metrics', {})).decode(),
+            historical_context=f'Historical Context: {historical_context}' if historical_context else ''
+        )
 
-Identify:
-1. Potential risks (supply, demand, external factors)
-2. Confidence level concerns
-3. Mitigation strategies
-"""
-        
         system_prompt = """You are a risk analyst specializing in supply chain and demand forecasting. 
 Provide practical risk assessments and mitigation strategies."""
         
-        result = self.generate(prompt, "risk_assessment", system_prompt, use_claude)
+        result = await self.generate(prompt, "risk_assessment", system_prompt, use_claude)
         
         if result["success"]:
             return result["text"]
@@ -1,15 +1,21 @@
 """RAG Service - Integrates with existing ChronoForge RAG system"""
+import asyncio
+import functools
+import logging
+import re
 import sys
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import uuid
 from datetime import datetime
 
+import numpy as np
+
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import LLMService
-from services.llm_service import LLMService
+from services.llm_service import get_llm_service
 
 # Try to import RAG components (optional)
 RAGQuery = None
@@ -17,12 +23,179 @@ RAGConfig = None
 LLMConfig = None
 RAGPipelineBuilder = None
 
+logger = logging.getLogger(__name__)
+
 try:
     from chronoforge_rag import RAGQuery, RAGConfig, LLMConfig
     from rag_pipeline import RAGPipelineBuilder
 except ImportError as e:
-    print(f"Warning: RAG imports failed: {e}")
-    print("RAG features will be limited. Build knowledge base to enable full RAG.")
+    logger.warning("RAG imports failed: %s. RAG features will be limited. "
+                   "Build knowledge base to enable full RAG.", e)
+
+try:
+    from embedding_engine import HashEmbedding
+except ImportError:
+    HashEmbedding = None
+
+
+# Sales-domain tokens that indicate a question can actually benefit from
+# searching the scenario knowledge base; greetings and meta questions
+# ("hello", "what can you do") skip the embed + vector search entirely
+_RETRIEVAL_TOKENS = re.compile(
+    r"\b(sale\w*|forecast\w*|demand|revenue|sell|sold|region\w*|categor\w*|"
+    r"product\w*|quarter\w*|q[1-4]|month\w*|week\w*|year\w*|season\w*|"
+    r"trend\w*|pattern\w*|histor\w*|growth|decline|peak\w*|holiday\w*|"
+    r"19\d\d|20\d\d|january|february|march|april|may|june|july|august|"
+    r"september|october|november|december)\b",
+    re.IGNORECASE,
+)
+
+
+class BatchingEmbedder:
+    """Micro-batches concurrent embed calls through one embed_batch pass
+
+    Embedders are throughput-bound per batch, not per request: 32 questions
+    in one forward pass cost far less than 32 single calls. Concurrent
+    queries enqueue (text, future) pairs; the queue flushes when it reaches
+    batch_size or after max_wait_ms, and each caller awaits its own row.
+    """
+
+    def __init__(self, embedder, batch_size: int = 32, max_wait_ms: float = 10.0):
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> List[float]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.batch_size:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            asyncio.ensure_future(self._flush())
+        elif self._timer is None:
+            self._timer = loop.create_task(self._flush_after_wait())
+
+        return await future
+
+    async def _flush_after_wait(self):
+        await asyncio.sleep(self.max_wait)
+        self._timer = None
+        await self._flush()
+
+    async def _flush(self):
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        texts = [text for text, _ in pending]
+        try:
+            # Off the event loop: embed_batch is a blocking forward pass
+            vectors = await asyncio.get_running_loop().run_in_executor(
+                None, self.embedder.embed_batch, texts
+            )
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), vector in zip(pending, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+
+class SemanticQueryCache:
+    """Embedding-similarity cache for RAG query responses
+
+    Near-identical (paraphrased) questions hit the full vector search and
+    an LLM call even though the answer would be the same. Cached query
+    embeddings are kept L2-normalized and symmetrically quantized to int8
+    (one scale per row), quartering the resident matrix versus float32; a
+    lookup quantizes the query once and scores everything with a single
+    integer matrix-vector product. Quantization error on normalized
+    vectors is well under the 0.95 similarity threshold's margin.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_entries: int = 2048):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._matrix: Optional[np.ndarray] = None   # int8, one row per entry
+        self._scales: Optional[np.ndarray] = None   # float32 de-quant scale per row
+        self._entries: List[Tuple[tuple, Dict[str, Any]]] = []
+
+    @staticmethod
+    def _quantize(embedding: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Symmetric int8 quantization: row * scale reconstructs float32"""
+        max_abs = float(np.max(np.abs(embedding)))
+        scale = (max_abs / 127.0) if max_abs else 1.0
+        q = np.clip(np.round(embedding / scale), -127, 127).astype(np.int8)
+        return q, scale
+
+    def lookup(self, embedding: np.ndarray, meta: tuple) -> Optional[Dict[str, Any]]:
+        """Return the cached response for the most similar prior query, if
+        it clears the threshold and was issued with the same filters"""
+        if self._matrix is None:
+            return None
+        q, q_scale = self._quantize(embedding)
+        # int32 accumulation (int8 dot products would overflow), then one
+        # multiply per row to undo both quantization scales
+        sims = (self._matrix.astype(np.int32) @ q.astype(np.int32)) * (self._scales * q_scale)
+        idx = int(np.argmax(sims))
+        if sims[idx] >= self.threshold and self._entries[idx][0] == meta:
+            return self._entries[idx][1]
+        return None
+
+    def insert(self, embedding: np.ndarray, meta: tuple, response: Dict[str, Any]):
+        q, scale = self._quantize(embedding)
+        row = q.reshape(1, -1)
+        if self._matrix is None:
+            self._matrix = row.copy()
+            self._scales = np.array([scale], dtype=np.float32)
+        else:
+            self._matrix = np.vstack([self._matrix, row])
+            self._scales = np.append(self._scales, np.float32(scale))
+        self._entries.append((meta, response))
+        if len(self._entries) > self.max_entries:
+            self._matrix = self._matrix[1:]
+            self._scales = self._scales[1:]
+            self._entries.pop(0)
+
+
+@functools.lru_cache(maxsize=4)
+def get_pipeline(kb_path: str):
+    """One RAG pipeline per knowledge-base path, shared process-wide
+
+    Building a pipeline loads the embedding model and vector store from
+    disk (hundreds of MB, seconds of latency), so it must never happen
+    per RAGService instance. Returns None when the RAG modules or the
+    knowledge base are unavailable.
+    """
+    try:
+        if not RAGPipelineBuilder:
+            logger.warning("RAG modules not available. Install dependencies and build knowledge base.")
+            return None
+
+        if os.path.exists(kb_path):
+            # Build pipeline with mock LLM (we'll use our LLM service instead)
+            builder = RAGPipelineBuilder()
+            builder.with_llm_config(LLMConfig(provider="mock"))
+            pipeline = builder.build_with_knowledge_base(kb_path)
+            logger.info("RAG pipeline initialized with knowledge base: %s", kb_path)
+            return pipeline
+
+        logger.warning("Knowledge base not found at %s", kb_path)
+    except Exception as e:
+        logger.warning("Failed to initialize RAG pipeline: %s", e)
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_rag_service() -> "RAGService":
+    """Process-wide RAGService singleton for route dependency injection"""
+    return RAGService()
 
 
 class RAGService:
@@ -30,40 +203,152 @@ class RAGService:
     
     def __init__(self, kb_path: str = "../kb"):
         self.kb_path = kb_path
-        self.pipeline = None
-        self.llm_service = LLMService()
-        self._initialize_pipeline()
-    
-    def _initialize_pipeline(self):
-        """Initialize RAG pipeline if knowledge base exists"""
+        # Pipeline and LLM client pools are shared across instances via
+        # their lru_cache factories - constructing another RAGService must
+        # not reload the embedding model or vector store
+        self.pipeline = get_pipeline(kb_path)
+        self.llm_service = get_llm_service()
+
+        # Semantic cache over query embeddings; falls back to lightweight
+        # n-gram hash embeddings when no pipeline embedder is available
+        self._query_cache = SemanticQueryCache()
+        self._cache_embedder = None
+        if self.pipeline is not None and hasattr(self.pipeline, "get_embedder"):
+            try:
+                self._cache_embedder = self.pipeline.get_embedder()
+            except Exception:
+                self._cache_embedder = None
+        if self._cache_embedder is None and HashEmbedding is not None:
+            self._cache_embedder = HashEmbedding()
+        self._batch_embedder = (BatchingEmbedder(self._cache_embedder)
+                                if self._cache_embedder is not None else None)
+
+        # Per-scenario rendered (source dict, context line) pairs, keyed by
+        # scenario id. The knowledge base is immutable once loaded and
+        # finite, so an unbounded dict is fine and retrieval stops paying
+        # the string formatting cost for scenarios it has served before
+        self._render_cache: Dict[str, Tuple[Dict[str, Any], str]] = {}
+
+    @staticmethod
+    def _needs_retrieval(question: str) -> bool:
+        """Cheap router: does this question warrant a knowledge-base search?"""
+        return bool(_RETRIEVAL_TOKENS.search(question))
+
+    async def _embed_query(self, question: str) -> Optional[np.ndarray]:
+        """Embed a question for cache lookups (L2-normalized float32)
+
+        Goes through the micro-batching wrapper so concurrent queries share
+        one embed_batch forward pass.
+        """
+        if self._batch_embedder is None:
+            return None
         try:
-            if not RAGPipelineBuilder:
-                print(f"⚠ RAG modules not available. Install dependencies and build knowledge base.")
-                return
-                
-            if os.path.exists(self.kb_path):
-                # Build pipeline with mock LLM (we'll use our LLM service instead)
-                builder = RAGPipelineBuilder()
-                builder.with_llm_config(LLMConfig(provider="mock"))
-                self.pipeline = builder.build_with_knowledge_base(self.kb_path)
-                print(f"✓ RAG pipeline initialized with knowledge base: {self.kb_path}")
-            else:
-                print(f"⚠ Knowledge base not found at {self.kb_path}")
-        except Exception as e:
-            print(f"⚠ Failed to initialize RAG pipeline: {e}")
-    
-    def query(self, question: str, use_claude: bool = False, 
-              top_k: int = 5, region_filter: str = None, 
-              category_filter: str = None) -> Dict[str, Any]:
+            vec = np.asarray(await self._batch_embedder.embed(question),
+                             dtype=np.float32)
+            norm = float(np.linalg.norm(vec))
+            return vec / norm if norm else None
+        except Exception:
+            return None
+
+    def _render_scenario(self, scenario) -> Tuple[Dict[str, Any], str]:
+        """Memoized (source dict, context line) for a knowledge-base scenario
+
+        Popular scenarios surface in many queries; rendering them once and
+        reusing the result beats re-running the dict build and $-formatting
+        on every retrieval.
+        """
+        cached = self._render_cache.get(scenario.id)
+        if cached is not None:
+            return cached
+
+        source = {
+            "date": scenario.date,
+            "description": scenario.description,
+            "sales_value": scenario.sales_value,
+            "region": scenario.region,
+            "category": scenario.category
+        }
+        context_line = (
+            f"{scenario.date}: {scenario.description} "
+            f"[Sales: ${scenario.sales_value:,.2f}, Region: {scenario.region}]"
+        )
+        self._render_cache[scenario.id] = (source, context_line)
+        return source, context_line
+
+    async def _search_sources(self, question: str, top_k: int,
+                              region_filter: str = None,
+                              category_filter: str = None) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Search the knowledge base and format (sources, context_docs)
+
+        kb.search is blocking (embedding + vector scan), so it runs in the
+        default executor; the event loop stays free to serve other
+        requests while the search is in flight.
+        """
+        rag_query = RAGQuery(
+            query_text=question,
+            top_k=top_k,
+            region_filter=region_filter,
+            category_filter=category_filter
+        )
+
+        kb = self.pipeline.get_knowledge_base()
+        search_results = await asyncio.get_running_loop().run_in_executor(
+            None, kb.search, rag_query
+        )
+
+        sources = []
+        context_docs = []
+        for result in search_results:
+            source, context_line = self._render_scenario(result.scenario)
+            # Similarity is per-query, so it lives outside the cached dict
+            sources.append({**source, "similarity_score": result.similarity_score})
+            context_docs.append(context_line)
+
+        return sources, context_docs
+
+    @staticmethod
+    def _build_answer_prompt(question: str, context_docs: List[str]) -> Tuple[str, str]:
+        """Render the (prompt, system_prompt) pair for answering a question"""
+        prompt = f"""Based on the following historical sales scenarios, answer this question:
+
+Question: {question}
+
+Historical Context:
+{chr(10).join(['- ' + doc for doc in context_docs])}
+
+Provide a clear, concise answer based on the historical patterns."""
+
+        system_prompt = """You are a sales forecasting analyst. Use historical data to provide
+insightful answers about sales patterns, trends, and forecasting."""
+
+        return prompt, system_prompt
+
+    async def query(self, question: str, use_claude: bool = False,
+                    top_k: int = 5, region_filter: str = None,
+                    category_filter: str = None) -> Dict[str, Any]:
         """Query the knowledge base with RAG"""
         try:
-            if not self.pipeline or not RAGQuery:
+            # Semantic cache: a sufficiently similar recent question (same
+            # filters) skips both the vector search and the LLM call
+            cache_meta = (use_claude, top_k, region_filter, category_filter)
+            q_emb = await self._embed_query(question)
+            if q_emb is not None:
+                cached = self._query_cache.lookup(q_emb, cache_meta)
+                if cached is not None:
+                    return {**cached, "query_id": str(uuid.uuid4()), "cached": True}
+
+            needs_retrieval = self._needs_retrieval(question)
+            if not needs_retrieval:
+                logger.debug("RAG router: no domain tokens, skipping retrieval for: %.60r",
+                             question)
+
+            if not self.pipeline or not RAGQuery or not needs_retrieval:
                 # Fallback: use LLM directly without RAG
                 prompt = f"Answer this question about sales forecasting: {question}"
                 system_prompt = "You are a sales forecasting analyst."
-                result = self.llm_service.generate(prompt, "simple_query", system_prompt, use_claude)
-                
-                return {
+                result = await self.llm_service.generate(prompt, "simple_query", system_prompt, use_claude)
+
+                response = {
                     "success": True,
                     "query_id": str(uuid.uuid4()),
                     "question": question,
@@ -71,56 +356,23 @@ class RAGService:
                     "sources": [],
                     "llm_used": result.get("model", "none"),
                     "created_at": datetime.utcnow().isoformat(),
-                    "note": "RAG pipeline not initialized"
+                    "note": ("retrieval skipped (no sales-domain tokens)"
+                             if self.pipeline and not needs_retrieval
+                             else "RAG pipeline not initialized")
                 }
+                if q_emb is not None and result["success"]:
+                    self._query_cache.insert(q_emb, cache_meta, response)
+                return response
             
-            # Create RAG query
-            rag_query = RAGQuery(
-                query_text=question,
-                top_k=top_k,
-                region_filter=region_filter,
-                category_filter=category_filter
+            sources, context_docs = await self._search_sources(
+                question, top_k, region_filter, category_filter
             )
-            
-            # Search knowledge base
-            kb = self.pipeline.get_knowledge_base()
-            search_results = kb.search(rag_query)
-            
-            # Format sources
-            sources = []
-            context_docs = []
-            
-            for result in search_results:
-                s = result.scenario
-                source = {
-                    "date": s.date,
-                    "description": s.description,
-                    "sales_value": s.sales_value,
-                    "region": s.region,
-                    "category": s.category,
-                    "similarity_score": result.similarity_score
-                }
-                sources.append(source)
-                context_docs.append(
-                    f"{s.date}: {s.description} [Sales: ${s.sales_value:,.2f}, Region: {s.region}]"
-                )
-            
+
             # Generate answer using LLM
             if context_docs:
-                prompt = f"""Based on the following historical sales scenarios, answer this question:
-
-Question: {question}
-
-Historical Context:
-{chr(10).join(['- ' + doc for doc in context_docs])}
-
-Provide a clear, concise answer based on the historical patterns."""
-                
-                system_prompt = """You are a sales forecasting analyst. Use historical data to provide 
-insightful answers about sales patterns, trends, and forecasting."""
-                
+                prompt, system_prompt = self._build_answer_prompt(question, context_docs)
                 task_type = "simple_query" if len(question) < 50 else "pattern_analysis"
-                result = self.llm_service.generate(prompt, task_type, system_prompt, use_claude)
+                result = await self.llm_service.generate(prompt, task_type, system_prompt, use_claude)
                 
                 if result["success"]:
                     answer = result["text"]
@@ -132,7 +384,7 @@ insightful answers about sales patterns, trends, and forecasting."""
                 answer = "No relevant historical data found for this query."
                 llm_used = "none"
             
-            return {
+            response = {
                 "success": True,
                 "query_id": str(uuid.uuid4()),
                 "question": question,
@@ -141,56 +393,94 @@ insightful answers about sales patterns, trends, and forecasting."""
                 "llm_used": llm_used,
                 "created_at": datetime.utcnow().isoformat()
             }
-            
+            if q_emb is not None and llm_used != "none":
+                self._query_cache.insert(q_emb, cache_meta, response)
+            return response
+
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e)
             }
-    
-    def explain_forecast_with_context(self, forecast_data: Dict[str, Any], 
-                                     use_claude: bool = False) -> Dict[str, Any]:
+
+    async def query_stream(self, question: str, top_k: int = 5,
+                           region_filter: str = None, category_filter: str = None):
+        """Stream a RAG answer as a sequence of event dicts (Ollama only)
+
+        Yields a sources event as soon as retrieval finishes, then one
+        token event per generated chunk, then a done event - so callers
+        see first tokens at prefill latency instead of waiting for the
+        whole completion.
+        """
+        query_id = str(uuid.uuid4())
+        try:
+            if (self.pipeline and RAGQuery
+                    and self._needs_retrieval(question)):
+                sources, context_docs = await self._search_sources(
+                    question, top_k, region_filter, category_filter
+                )
+            else:
+                sources, context_docs = [], []
+
+            yield {"type": "sources", "query_id": query_id, "sources": sources}
+
+            if context_docs:
+                prompt, system_prompt = self._build_answer_prompt(question, context_docs)
+            else:
+                prompt = f"Answer this question about sales forecasting: {question}"
+                system_prompt = "You are a sales forecasting analyst."
+
+            async for token in self.llm_service.stream_with_ollama(prompt, system_prompt):
+                yield {"type": "token", "text": token}
+
+            yield {"type": "done", "query_id": query_id}
+        except Exception as e:
+            yield {"type": "error", "query_id": query_id, "error": str(e)}
+
+    async def explain_forecast_with_context(self, forecast_data: Dict[str, Any],
+                                            use_claude: bool = False) -> Dict[str, Any]:
         """Explain forecast using historical context from RAG"""
         try:
-            if not self.pipeline:
-                # Fallback to simple explanation without RAG
-                explanation = self.llm_service.explain_forecast(forecast_data, use_claude)
+            preds = forecast_data.get("predictions") or []
+            if not self.pipeline or not preds:
+                # Fallback to simple explanation without RAG (no pipeline,
+                # or nothing to build a retrieval query from)
+                explanation = await self.llm_service.explain_forecast(forecast_data, use_claude)
                 return {
                     "success": True,
                     "explanation": explanation,
                     "sources": [],
                     "llm_used": "claude" if use_claude else "ollama"
                 }
-            
+
             # Search for similar historical patterns
-            avg_prediction = sum(forecast_data.get("predictions", [0])) / len(forecast_data.get("predictions", [1]))
+            avg_prediction = float(np.mean(np.asarray(preds, dtype=np.float32)))
             query_text = f"Sales around ${avg_prediction:.0f} with similar patterns"
             
             rag_query = RAGQuery(query_text=query_text, top_k=3)
             kb = self.pipeline.get_knowledge_base()
-            search_results = kb.search(rag_query)
+            # Blocking search goes to the executor, same as _search_sources
+            search_results = await asyncio.get_running_loop().run_in_executor(
+                None, kb.search, rag_query
+            )
             
-            # Format historical context
+            # Format historical context (from the per-scenario render cache)
             context_docs = []
             sources = []
             for result in search_results:
-                s = result.scenario
-                context_docs.append(
-                    f"{s.date}: {s.description} [Sales: ${s.sales_value:,.2f}]"
-                )
-                sources.append({
-                    "date": s.date,
-                    "description": s.description,
-                    "sales_value": s.sales_value
-                })
+                source, context_line = self._render_scenario(result.scenario)
+                context_docs.append(context_line)
+                sources.append({k: source[k]
+                                for k in ("date", "description", "sales_value")})
             
             # Generate explanation with historical context
+            m = forecast_data.get('metrics', {})
             prompt = f"""Explain this demand forecast using historical patterns:
 
 Forecast:
-- Predictions: {forecast_data.get('predictions', [])}
+- Predictions: {preds}
 - Model: {forecast_data.get('model_used', 'unknown')}
-- Metrics: MAPE={forecast_data.get('metrics', {}).get('mape', 0):.2f}%, RMSE={forecast_data.get('metrics', {}).get('rmse', 0):.2f}
+- Metrics: MAPE={m.get('mape', 0):.2f}%, RMSE={m.get('rmse', 0):.2f}
 
 Similar Historical Patterns:
 {chr(10).join(['- ' + doc for doc in context_docs]) if context_docs else 'No similar patterns found'}
@@ -205,7 +495,7 @@ Provide:
             system_prompt = """You are a sales forecasting expert. Explain forecasts clearly using 
 historical context and provide actionable business insights."""
             
-            result = self.llm_service.generate(prompt, "forecast_explanation", system_prompt, use_claude)
+            result = await self.llm_service.generate(prompt, "forecast_explanation", system_prompt, use_claude)
             
             explanation = result["text"] if result["success"] else "Unable to generate explanation"
             
@@ -1,19 +1,34 @@
 """Training service for background model retraining"""
+import functools
+import logging
+import os
 import numpy as np
 import pandas as pd
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List
 from datetime import datetime
 
-from models.forecasting_models import ForecastingModels
 from utils.model_evaluator import ModelEvaluator
 from utils.background_tasks import task_manager, TaskStatus
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=1)
+def get_training_service() -> "TrainingService":
+    """Process-wide TrainingService singleton for route dependency injection"""
+    return TrainingService()
+
 
 class TrainingService:
     """Handles background model training"""
     
     def __init__(self):
+        # Deferred import: keeps the heavy ML stack out of route-module
+        # import time (see ForecastService.__init__)
+        from models.forecasting_models import ForecastingModels
+
         self.models = ForecastingModels()
         self.evaluator = ModelEvaluator()
     
@@ -36,92 +51,91 @@ class TrainingService:
         
         return job_id
     
+    def _train_one(self, name: str, train_data: np.ndarray,
+                   val_data: np.ndarray) -> tuple:
+        """Train one model by name and evaluate it on the validation slice
+
+        Returns (metrics, trained_model) or (None, None) when the model
+        could not be fit or produced no predictions.
+        """
+        if name == "sarima":
+            model = self.models.train_sarima(train_data)
+            preds = self.models.predict_sarima(model, len(val_data)) if model else None
+            trained = model
+        elif name == "lstm":
+            lstm, scaler = self.models.train_lstm(train_data)
+            if lstm and scaler:
+                preds = self.models.predict_lstm(lstm, scaler, train_data, len(val_data))
+                trained = {"model": lstm, "scaler": scaler}
+            else:
+                preds, trained = None, None
+        elif name == "xgboost":
+            model = self.models.train_xgboost(train_data)
+            preds = self.models.predict_xgboost(model, train_data, len(val_data)) if model else None
+            trained = model
+        elif name == "lightgbm":
+            model = self.models.train_lightgbm(train_data)
+            preds = self.models.predict_lightgbm(model, train_data, len(val_data)) if model else None
+            trained = model
+        elif name == "prophet":
+            model = self.models.train_prophet(train_data)
+            preds = self.models.predict_prophet(model, len(val_data)) if model else None
+            trained = model
+        else:
+            preds, trained = None, None
+
+        if trained is None or not preds:
+            return None, None
+
+        metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
+        return metrics, trained
+
     def train_and_evaluate(self, data: np.ndarray, dataset_id: str = None) -> Dict[str, Any]:
-        """Train all models and evaluate performance"""
-        print(f"Starting training on {len(data)} data points...")
-        
+        """Train all models and evaluate performance (in parallel)
+
+        The fits run in GIL-releasing native code, so a thread pool gets
+        wall time close to the slowest single model instead of the sum of
+        all five (the models themselves are not picklable across processes).
+        """
+        # logging with %-args defers formatting until a handler actually
+        # emits the record, and keeps the training threads off the stdout
+        # lock that print would serialize them on
+        logger.info("Starting training on %d data points...", len(data))
+
         # Split data for validation
         split_idx = int(len(data) * 0.8)
         train_data = data[:split_idx]
         val_data = data[split_idx:]
-        
+
         model_results = {}
         trained_models = {}
-        
-        # Train SARIMA
-        try:
-            print("Training SARIMA...")
-            sarima = self.models.train_sarima(train_data)
-            if sarima:
-                preds = self.models.predict_sarima(sarima, len(val_data))
-                if preds:
-                    metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
-                    model_results["sarima"] = metrics
-                    trained_models["sarima"] = sarima
-                    print(f"✓ SARIMA: MAPE={metrics['mape']:.2f}%, RMSE={metrics['rmse']:.2f}")
-        except Exception as e:
-            print(f"✗ SARIMA failed: {e}")
-        
-        # Train LSTM
-        try:
-            print("Training LSTM...")
-            lstm, scaler = self.models.train_lstm(train_data)
-            if lstm and scaler:
-                preds = self.models.predict_lstm(lstm, scaler, train_data, len(val_data))
-                if preds:
-                    metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
-                    model_results["lstm"] = metrics
-                    trained_models["lstm"] = {"model": lstm, "scaler": scaler}
-                    print(f"✓ LSTM: MAPE={metrics['mape']:.2f}%, RMSE={metrics['rmse']:.2f}")
-        except Exception as e:
-            print(f"✗ LSTM failed: {e}")
-        
-        # Train XGBoost
-        try:
-            print("Training XGBoost...")
-            xgb = self.models.train_xgboost(train_data)
-            if xgb:
-                preds = self.models.predict_xgboost(xgb, train_data, len(val_data))
-                if preds:
-                    metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
-                    model_results["xgboost"] = metrics
-                    trained_models["xgboost"] = xgb
-                    print(f"✓ XGBoost: MAPE={metrics['mape']:.2f}%, RMSE={metrics['rmse']:.2f}")
-        except Exception as e:
-            print(f"✗ XGBoost failed: {e}")
-        
-        # Train LightGBM
-        try:
-            print("Training LightGBM...")
-            lgbm = self.models.train_lightgbm(train_data)
-            if lgbm:
-                preds = self.models.predict_lightgbm(lgbm, train_data, len(val_data))
-                if preds:
-                    metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
-                    model_results["lightgbm"] = metrics
-                    trained_models["lightgbm"] = lgbm
-                    print(f"✓ LightGBM: MAPE={metrics['mape']:.2f}%, RMSE={metrics['rmse']:.2f}")
-        except Exception as e:
-            print(f"✗ LightGBM failed: {e}")
-        
-        # Train Prophet
-        try:
-            print("Training Prophet...")
-            prophet = self.models.train_prophet(train_data)
-            if prophet:
-                preds = self.models.predict_prophet(prophet, len(val_data))
-                if preds:
-                    metrics = self.evaluator.evaluate_model(val_data, np.array(preds))
-                    model_results["prophet"] = metrics
-                    trained_models["prophet"] = prophet
-                    print(f"✓ Prophet: MAPE={metrics['mape']:.2f}%, RMSE={metrics['rmse']:.2f}")
-        except Exception as e:
-            print(f"✗ Prophet failed: {e}")
-        
+
+        names = ("sarima", "lstm", "xgboost", "lightgbm", "prophet")
+        with ThreadPoolExecutor(max_workers=min(len(names), os.cpu_count() or 1)) as executor:
+            futures = {
+                executor.submit(self._train_one, name, train_data, val_data): name
+                for name in names
+            }
+
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    metrics, trained = future.result()
+                except Exception as e:
+                    logger.warning("%s failed: %s", name, e)
+                    continue
+
+                if metrics is not None:
+                    model_results[name] = metrics
+                    trained_models[name] = trained
+                    logger.info("%s: MAPE=%.2f%% RMSE=%.2f",
+                                name, metrics['mape'], metrics['rmse'])
+
         # Select best model
         best_model, best_metrics = self.evaluator.select_best_model(model_results)
-        
-        print(f"\n✓ Training complete. Best model: {best_model} (MAPE: {best_metrics.get('mape', 0):.2f}%)")
+
+        logger.info("Training complete. Best model: %s (MAPE: %.2f%%)",
+                    best_model, best_metrics.get('mape', 0))
         
         return {
             "dataset_id": dataset_id,
@@ -146,9 +160,11 @@ class TrainingService:
             "success": True,
             "job_id": job_id,
             "status": task["status"],
-            "created_at": task["created_at"].isoformat() if task.get("created_at") else None,
-            "started_at": task["started_at"].isoformat() if task.get("started_at") else None,
-            "completed_at": task["completed_at"].isoformat() if task.get("completed_at") else None,
+            # ISO strings are pre-rendered by the task manager when the
+            # timestamps are set; polls just copy them
+            "created_at": task.get("created_at_iso"),
+            "started_at": task.get("started_at_iso"),
+            "completed_at": task.get("completed_at_iso"),
             "result": task.get("result"),
             "error": task.get("error")
         }
@@ -1,6 +1,8 @@
 """Background task manager for async operations"""
 import asyncio
-from typing import Dict, Any, Callable
+import heapq
+import time
+from typing import Any, Callable, Dict, List, Tuple
 from datetime import datetime
 from enum import Enum
 
@@ -17,53 +19,69 @@ class BackgroundTaskManager:
     
     def __init__(self):
         self.tasks: Dict[str, Dict[str, Any]] = {}
+        # Min-heap of (completion epoch, task_id) so cleanup pops only the
+        # tasks that are actually expired instead of scanning all of them
+        self._completed_heap: List[Tuple[float, str]] = []
     
     def create_task(self, task_id: str, task_name: str) -> Dict[str, Any]:
         """Create a new background task"""
+        created_at = datetime.utcnow()
+        # Timestamps are rendered to ISO strings once when set, so status
+        # polls (1Hz per watching client) only read precomputed fields
         task = {
             "task_id": task_id,
             "task_name": task_name,
             "status": TaskStatus.PENDING,
-            "created_at": datetime.utcnow(),
+            "created_at": created_at,
+            "created_at_iso": created_at.isoformat(),
             "started_at": None,
+            "started_at_iso": None,
             "completed_at": None,
+            "completed_at_iso": None,
             "result": None,
             "error": None
         }
         self.tasks[task_id] = task
         return task
-    
-    def update_status(self, task_id: str, status: TaskStatus, 
+
+    def update_status(self, task_id: str, status: TaskStatus,
                       result: Any = None, error: str = None):
         """Update task status"""
-        if task_id in self.tasks:
-            self.tasks[task_id]["status"] = status
-            
+        task = self.tasks.get(task_id)
+        if task is not None:
+            task["status"] = status
+
             if status == TaskStatus.PROCESSING:
-                self.tasks[task_id]["started_at"] = datetime.utcnow()
+                task["started_at"] = datetime.utcnow()
+                task["started_at_iso"] = task["started_at"].isoformat()
             elif status in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
-                self.tasks[task_id]["completed_at"] = datetime.utcnow()
-                self.tasks[task_id]["result"] = result
-                self.tasks[task_id]["error"] = error
+                task["completed_at"] = datetime.utcnow()
+                task["completed_at_iso"] = task["completed_at"].isoformat()
+                task["result"] = result
+                task["error"] = error
+                heapq.heappush(self._completed_heap, (time.time(), task_id))
     
     def get_task_status(self, task_id: str) -> Dict[str, Any]:
         """Get task status"""
         return self.tasks.get(task_id, {})
     
     def cleanup_old_tasks(self, max_age_hours: int = 24):
-        """Remove old completed tasks"""
-        current_time = datetime.utcnow()
-        to_remove = []
-        
-        for task_id, task in self.tasks.items():
-            if task["status"] in [TaskStatus.COMPLETED, TaskStatus.FAILED]:
-                if task["completed_at"]:
-                    age = (current_time - task["completed_at"]).total_seconds() / 3600
-                    if age > max_age_hours:
-                        to_remove.append(task_id)
-        
-        for task_id in to_remove:
-            del self.tasks[task_id]
+        """Remove old completed tasks
+
+        Pops expired entries off the completion-time heap, so the cost is
+        O(k log n) in the number of actually-expired tasks rather than a
+        scan of the full task table.
+        """
+        cutoff = time.time() - max_age_hours * 3600
+        heap = self._completed_heap
+
+        while heap and heap[0][0] < cutoff:
+            _, task_id = heapq.heappop(heap)
+            task = self.tasks.get(task_id)
+            # Guard: the id may already be gone, or the task re-used and
+            # running again (a newer heap entry will cover it)
+            if task is not None and task["status"] in (TaskStatus.COMPLETED, TaskStatus.FAILED):
+                del self.tasks[task_id]
 
 
 # Global task manager instance
@@ -2,95 +2,275 @@
 import numpy as np
 from typing import List, Dict, Tuple
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Metric kernels as free functions. The numpy versions below are the
+# portable fallback; when numba is installed they are replaced with
+# compiled single-pass loops (no temporaries for the element-wise ops).
+
+def _mape(actual: np.ndarray, predicted: np.ndarray) -> float:
+    # Branchless: np.where keeps every op contiguous and SIMD-friendly,
+    # where a boolean-mask gather would materialize subarrays and defeat
+    # vectorization on the division
+    n = int(np.count_nonzero(actual))
+    if n == 0:
+        return 100.0
+    safe_actual = np.where(actual != 0, actual, 1.0)
+    pct = np.abs((actual - predicted) / safe_actual)
+    pct = np.where(actual != 0, pct, 0.0)
+    return float(pct.sum()) / n * 100.0
+
+
+def _rmse(actual: np.ndarray, predicted: np.ndarray) -> float:
+    return np.sqrt(np.mean((actual - predicted) ** 2))
+
+
+def _mae(actual: np.ndarray, predicted: np.ndarray) -> float:
+    return np.mean(np.abs(actual - predicted))
+
+
+def _r2(actual: np.ndarray, predicted: np.ndarray) -> float:
+    ss_res = np.sum((actual - predicted) ** 2)
+    ss_tot = np.sum((actual - np.mean(actual)) ** 2)
+    return 1.0 - ss_res / ss_tot if ss_tot != 0 else 0.0
+
+
+def _metrics_all(actual: np.ndarray, predicted: np.ndarray):
+    """Compute (mape, rmse, mae, r2) sharing one diff pass
+
+    Calling the four metric functions separately walks the arrays four
+    times and re-materializes the difference each time; here diff and
+    abs_diff are built once and everything derives from them (einsum for
+    the sums of squares avoids the squared temporaries).
+    """
+    n = actual.shape[0]
+    diff = actual - predicted
+    abs_diff = np.abs(diff)
+
+    ss_res = float(np.einsum('i,i->', diff, diff))
+    rmse = float(np.sqrt(ss_res / n))
+    mae = float(abs_diff.mean())
+
+    nonzero = actual != 0
+    nz = int(np.count_nonzero(nonzero))
+    if nz:
+        pct = np.divide(abs_diff, np.abs(actual),
+                        out=np.zeros_like(abs_diff), where=nonzero)
+        mape = float(pct.sum() / nz * 100.0)
+    else:
+        mape = 100.0
+
+    centered = actual - actual.mean()
+    ss_tot = float(np.einsum('i,i->', centered, centered))
+    r2 = 1.0 - ss_res / ss_tot if ss_tot else 0.0
+
+    return mape, rmse, mae, r2
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _mape(actual, predicted):
+        total = 0.0
+        count = 0
+        for i in range(actual.shape[0]):
+            if actual[i] != 0:
+                total += abs((actual[i] - predicted[i]) / actual[i])
+                count += 1
+        if count == 0:
+            return 100.0
+        return total / count * 100.0
+
+    @njit(cache=True, fastmath=True)
+    def _rmse(actual, predicted):
+        total = 0.0
+        for i in range(actual.shape[0]):
+            diff = actual[i] - predicted[i]
+            total += diff * diff
+        return np.sqrt(total / actual.shape[0])
+
+    @njit(cache=True, fastmath=True)
+    def _mae(actual, predicted):
+        total = 0.0
+        for i in range(actual.shape[0]):
+            total += abs(actual[i] - predicted[i])
+        return total / actual.shape[0]
+
+    @njit(cache=True, fastmath=True)
+    def _r2(actual, predicted):
+        n = actual.shape[0]
+        mean = 0.0
+        for i in range(n):
+            mean += actual[i]
+        mean /= n
+        ss_res = 0.0
+        ss_tot = 0.0
+        for i in range(n):
+            diff = actual[i] - predicted[i]
+            ss_res += diff * diff
+            dev = actual[i] - mean
+            ss_tot += dev * dev
+        if ss_tot == 0.0:
+            return 0.0
+        return 1.0 - ss_res / ss_tot
+
+    @njit(cache=True, fastmath=True)
+    def _metrics_kernel(actual, predicted):
+        """All four metrics in one compiled loop, no temporaries
+
+        On the short validation slices this code sees, numpy's per-ufunc
+        dispatch costs more than the arithmetic; a single native loop
+        accumulating every sum at once sidesteps that entirely.
+        """
+        n = actual.shape[0]
+        sum_abs = 0.0
+        sum_sq = 0.0
+        sum_pct = 0.0
+        sum_actual = 0.0
+        nz = 0
+        for i in range(n):
+            diff = actual[i] - predicted[i]
+            sum_sq += diff * diff
+            abs_diff = abs(diff)
+            sum_abs += abs_diff
+            sum_actual += actual[i]
+            if actual[i] != 0:
+                sum_pct += abs_diff / abs(actual[i])
+                nz += 1
+
+        mape = sum_pct / nz * 100.0 if nz else 100.0
+        rmse = np.sqrt(sum_sq / n)
+        mae = sum_abs / n
+
+        mean = sum_actual / n
+        ss_tot = 0.0
+        for i in range(n):
+            dev = actual[i] - mean
+            ss_tot += dev * dev
+        r2 = 1.0 - sum_sq / ss_tot if ss_tot != 0.0 else 0.0
+
+        return mape, rmse, mae, r2
+
+    # Pay the JIT compilation cost once at import instead of on the first
+    # forecast request
+    _warm = np.arange(10, dtype=np.float64)
+    _mape(_warm, _warm)
+    _rmse(_warm, _warm)
+    _mae(_warm, _warm)
+    _r2(_warm, _warm)
+    _metrics_kernel(_warm, _warm)
+    del _warm
+
 
 class ModelEvaluator:
     """Evaluate and compare forecasting models"""
-    
+
     @staticmethod
     def calculate_mape(actual: np.ndarray, predicted: np.ndarray) -> float:
         """Calculate Mean Absolute Percentage Error"""
         try:
-            # Avoid division by zero
-            mask = actual != 0
-            if not mask.any():
-                return 100.0
-            
-            mape = np.mean(np.abs((actual[mask] - predicted[mask]) / actual[mask])) * 100
-            return float(mape)
+            return float(_mape(np.ascontiguousarray(actual, dtype=np.float64),
+                               np.ascontiguousarray(predicted, dtype=np.float64)))
         except:
             return 100.0
-    
+
     @staticmethod
     def calculate_rmse(actual: np.ndarray, predicted: np.ndarray) -> float:
         """Calculate Root Mean Square Error"""
         try:
-            rmse = np.sqrt(np.mean((actual - predicted) ** 2))
-            return float(rmse)
+            return float(_rmse(np.ascontiguousarray(actual, dtype=np.float64),
+                               np.ascontiguousarray(predicted, dtype=np.float64)))
         except:
             return float('inf')
-    
+
     @staticmethod
     def calculate_mae(actual: np.ndarray, predicted: np.ndarray) -> float:
         """Calculate Mean Absolute Error"""
         try:
-            mae = np.mean(np.abs(actual - predicted))
-            return float(mae)
+            return float(_mae(np.ascontiguousarray(actual, dtype=np.float64),
+                              np.ascontiguousarray(predicted, dtype=np.float64)))
         except:
             return float('inf')
-    
+
     @staticmethod
     def calculate_r2(actual: np.ndarray, predicted: np.ndarray) -> float:
         """Calculate R-squared score"""
         try:
-            ss_res = np.sum((actual - predicted) ** 2)
-            ss_tot = np.sum((actual - np.mean(actual)) ** 2)
-            r2 = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-            return float(r2)
+            return float(_r2(np.ascontiguousarray(actual, dtype=np.float64),
+                             np.ascontiguousarray(predicted, dtype=np.float64)))
         except:
             return 0.0
-    
+
     @staticmethod
     def evaluate_model(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, float]:
-        """Calculate all metrics for a model"""
-        return {
-            "mape": ModelEvaluator.calculate_mape(actual, predicted),
-            "rmse": ModelEvaluator.calculate_rmse(actual, predicted),
-            "mae": ModelEvaluator.calculate_mae(actual, predicted),
-            "r2": ModelEvaluator.calculate_r2(actual, predicted)
-        }
-    
+        """Calculate all metrics for a model in one fused pass"""
+        try:
+            # Cast once so the kernel gets contiguous float64 views
+            actual = np.ascontiguousarray(actual, dtype=np.float64)
+            predicted = np.ascontiguousarray(predicted, dtype=np.float64)
+            # Compiled single-loop kernel wins while per-call dispatch
+            # dominates; beyond that the BLAS-backed numpy path keeps up
+            if NUMBA_AVAILABLE and actual.shape[0] < 10_000:
+                mape, rmse, mae, r2 = _metrics_kernel(actual, predicted)
+            else:
+                mape, rmse, mae, r2 = _metrics_all(actual, predicted)
+            return {"mape": mape, "rmse": rmse, "mae": mae, "r2": r2}
+        except:
+            return {
+                "mape": ModelEvaluator.calculate_mape(actual, predicted),
+                "rmse": ModelEvaluator.calculate_rmse(actual, predicted),
+                "mae": ModelEvaluator.calculate_mae(actual, predicted),
+                "r2": ModelEvaluator.calculate_r2(actual, predicted)
+            }
+
     @staticmethod
     def select_best_model(model_results: Dict[str, Dict[str, float]]) -> Tuple[str, Dict[str, float]]:
-        """Select best model based on MAPE (lower is better)"""
+        """Select best model based on MAPE (lower is better)
+
+        Single online reduction: one pass, no intermediate filtered dict,
+        and models at exactly MAPE==100 (no valid predictions) can never
+        win outright.
+        """
         if not model_results:
             return "none", {}
-        
-        # Filter out models with no valid predictions
-        valid_models = {
-            name: metrics 
-            for name, metrics in model_results.items() 
-            if metrics.get("mape", 100) < 100
-        }
-        
-        if not valid_models:
+
+        best_name = None
+        best_metrics = None
+        best_mape = float('inf')
+        for name, metrics in model_results.items():
+            mape = metrics.get("mape", 100)
+            if mape < 100 and mape < best_mape:
+                best_name, best_metrics, best_mape = name, metrics, mape
+
+        if best_name is None:
             # Return first available model as fallback
-            first_model = list(model_results.keys())[0]
+            first_model = next(iter(model_results))
             return first_model, model_results[first_model]
-        
-        # Select model with lowest MAPE
-        best_model = min(valid_models.items(), key=lambda x: x[1]["mape"])
-        return best_model[0], best_model[1]
-    
+
+        return best_name, best_metrics
+
     @staticmethod
-    def calculate_confidence_interval(predictions: List[float], 
-                                     confidence_level: float = 0.95) -> Dict[str, List[float]]:
-        """Calculate confidence intervals for predictions"""
+    def calculate_confidence_interval(predictions: List[float],
+                                     confidence_level: float = 0.95,
+                                     as_list: bool = True) -> Dict[str, List[float]]:
+        """Calculate confidence intervals for predictions
+
+        Accepts a list or an ndarray (float64 arrays are used without
+        copying). With as_list=False the bounds come back as ndarrays,
+        skipping the per-element tolist() materialization for callers
+        that do further array math; the default keeps the JSON-friendly
+        list shape the response layer expects.
+        """
         try:
-            predictions_array = np.array(predictions)
-            
+            predictions_array = np.asarray(predictions, dtype=np.float64)
+
             # Estimate standard deviation (simple method)
-            std_dev = np.std(predictions_array) if len(predictions_array) > 1 else predictions_array[0] * 0.1
-            
+            std_dev = predictions_array.std() if predictions_array.size > 1 else predictions_array[0] * 0.1
+
             # Z-score for confidence level
             z_scores = {
                 0.90: 1.645,
@@ -98,12 +278,19 @@ class ModelEvaluator:
                 0.99: 2.576
             }
             z = z_scores.get(confidence_level, 1.96)
-            
+
+            # Scalar margin broadcast over one subtract/add each - no
+            # intermediate margin array
             margin = z * std_dev
-            
-            lower = (predictions_array - margin).tolist()
-            upper = (predictions_array + margin).tolist()
-            
+
+            lower = predictions_array - margin
+            upper = predictions_array + margin
+
+            if as_list:
+                return {
+                    "lower": lower.tolist(),
+                    "upper": upper.tolist()
+                }
             return {
                 "lower": lower,
                 "upper": upper
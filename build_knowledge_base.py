@@ -13,12 +13,75 @@ Example:
 
 import sys
 import os
+import csv
+import json
 import argparse
+from typing import Iterator, List
 
-from chronoforge_rag import EmbeddingConfig, VectorStoreConfig
+from chronoforge_rag import EmbeddingConfig, VectorStoreConfig, SalesScenario, IKnowledgeBase
+from embedding_engine import IEmbeddingEngine, create_embedding_engine
 from knowledge_base import create_knowledge_base
 
 
+def iter_scenarios(paths: List[str]) -> Iterator[SalesScenario]:
+    """Stream scenarios from CSV/JSON files as one flat iterator.
+
+    Rows are yielded lazily so bulk_import never holds more than one
+    batch of scenarios in memory at a time.
+    """
+    for file_path in paths:
+        if not os.path.exists(file_path):
+            print(f"⚠ Warning: File not found: {file_path}")
+            continue
+
+        ext = os.path.splitext(file_path)[1].lower()
+
+        if ext == ".csv":
+            with open(file_path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    yield SalesScenario.from_dict(row)
+        elif ext == ".json":
+            with open(file_path, encoding="utf-8") as f:
+                data = json.load(f)
+            for row in (data if isinstance(data, list) else data.get("scenarios", [])):
+                yield SalesScenario.from_dict(row)
+        else:
+            print(f"  ⚠ Unsupported format: {ext}")
+
+
+def bulk_import(kb: IKnowledgeBase, embedder: IEmbeddingEngine,
+                paths: List[str], batch_size: int = 256) -> int:
+    """Import all files through one batched embedder pass.
+
+    The per-file loop used to embed scenarios one at a time, which pays
+    the model-call overhead per row. Here descriptions are embedded in
+    batch_size-wide lists (one forward pass each) and the pre-embedded
+    scenarios are handed to the knowledge base in bulk.
+    """
+    total = 0
+    batch: List[SalesScenario] = []
+
+    def flush():
+        nonlocal total
+        if not batch:
+            return
+        embeddings = embedder.embed_batch([s.description for s in batch])
+        for scenario, embedding in zip(batch, embeddings):
+            scenario.embedding = embedding
+        kb.add_scenarios(batch)
+        total += len(batch)
+        print(f"  ✓ Imported {total} scenarios so far...")
+        batch.clear()
+
+    for scenario in iter_scenarios(paths):
+        batch.append(scenario)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    return total
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Build ChronoForge RAG Knowledge Base",
@@ -75,30 +138,11 @@ Examples:
         
         kb = create_knowledge_base(embed_config, vs_config)
         print("✓ Knowledge base initialized\n")
-        
-        # Process each input file
-        total_imported = 0
-        
-        for file_path in args.data_files:
-            if not os.path.exists(file_path):
-                print(f"⚠ Warning: File not found: {file_path}")
-                continue
-            
-            print(f"Processing: {file_path}")
-            
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == ".csv":
-                count = kb.import_from_csv(file_path)
-            elif ext == ".json":
-                count = kb.import_from_json(file_path)
-            else:
-                print(f"  ⚠ Unsupported format: {ext}")
-                continue
-            
-            print(f"  ✓ Imported {count} scenarios")
-            total_imported += count
-        
+
+        # Import all files in one batched pass
+        embedder = create_embedding_engine(embed_config)
+        total_imported = bulk_import(kb, embedder, args.data_files)
+
         if total_imported == 0:
             print("\n No scenarios imported. Aborting.")
             return 1
@@ -6,11 +6,20 @@ Python implementation using APIs for embeddings and LLM.
 """
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict, Tuple, Any
+from typing import Optional, List, Dict, Tuple, Any, Sequence, Union
 from abc import ABC, abstractmethod
 from datetime import datetime
+import math
 import time
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 # =============================================================================
 # Configuration Constants
 # =============================================================================
@@ -46,8 +55,8 @@ class SalesScenario:
     seasonality: str = ""
     epidemic_flag: bool = False
     
-    # Embedding (populated by embedding engine)
-    embedding: List[float] = field(default_factory=list)
+    # Embedding (populated by embedding engine; float32 ndarray)
+    embedding: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
     
     # Metadata
     metadata: Dict[str, str] = field(default_factory=dict)
@@ -166,6 +175,9 @@ class EmbeddingConfig:
     use_api: bool = False  # If True, use API (OpenAI/Gemini) instead of local
     api_key: Optional[str] = None
     api_provider: str = "openai"  # "openai" or "gemini"
+    batch_size: int = 100  # texts per embedding batch/API request
+    cache_path: Optional[str] = None  # sqlite file for persistent embed cache
+    device: Optional[str] = None  # "cuda"/"cpu" for local models; None = auto
 
 
 @dataclass
@@ -174,6 +186,7 @@ class VectorStoreConfig:
     dimension: int = DEFAULT_EMBEDDING_DIM
     persist_directory: str = "./chroma_db"
     collection_name: str = "sales_scenarios"
+    quantization: str = "fp32"  # "fp32" or "sq8" (int8 scalar quantization)
 
 
 @dataclass
@@ -213,15 +226,20 @@ Be concise, data-driven, and always reference the specific scenarios you're draw
 # =============================================================================
 
 class IEmbeddingEngine(ABC):
-    """Interface for embedding generation."""
-    
+    """Interface for embedding generation.
+
+    Vectors are contiguous float32 ndarrays - shape (d,) for single
+    texts, (n, d) for batches - so consumers never pay a list<->ndarray
+    round trip.
+    """
+
     @abstractmethod
-    def embed(self, text: str) -> List[float]:
+    def embed(self, text: str) -> "np.ndarray":
         """Generate embedding for a single text."""
         pass
-    
+
     @abstractmethod
-    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+    def embed_batch(self, texts: List[str]) -> "np.ndarray":
         """Generate embeddings for multiple texts."""
         pass
     
@@ -329,19 +347,94 @@ class IKnowledgeBase(ABC):
 # Utility Functions
 # =============================================================================
 
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    if len(a) != len(b):
+_F32 = np.float32
+
+
+def _make_cos_kernel(d: int):
+    """Build a numba cosine kernel specialized to dimension d.
+
+    The fixed trip count is a compile-time constant, so LLVM unrolls and
+    fuses the three accumulations into FMA lanes - one pass over the
+    vectors with no BLAS call overhead at these small sizes. Closures
+    cannot use numba's on-disk cache, so each kernel compiles once per
+    process on its first (or warm-up) call.
+    """
+    @njit(fastmath=True)
+    def _cos(a, b):
+        s = 0.0
+        d1 = 0.0
+        d2 = 0.0
+        for i in range(d):
+            s += a[i] * b[i]
+            d1 += a[i] * a[i]
+            d2 += b[i] * b[i]
+        if d1 == 0.0 or d2 == 0.0:
+            return 0.0
+        return s / math.sqrt(d1 * d2)
+    return _cos
+
+
+# Specializations for the embedding dimensions the engines produce
+# (MiniLM / Gemini / OpenAI)
+_COS_KERNELS = (
+    {d: _make_cos_kernel(d) for d in (384, 768, 1536)} if NUMBA_AVAILABLE else {}
+)
+
+
+def warm_cosine_kernel(dimension: int):
+    """Trigger JIT compilation for a dimension ahead of the first query."""
+    kernel = _COS_KERNELS.get(dimension)
+    if kernel is not None:
+        kernel(np.ones(dimension, dtype=_F32), np.ones(dimension, dtype=_F32))
+
+
+def cosine_similarity(a: Union[Sequence[float], np.ndarray],
+                      b: Union[Sequence[float], np.ndarray]) -> float:
+    """Compute cosine similarity between two vectors.
+
+    Inputs are coerced to contiguous float32 once; known embedding
+    dimensions dispatch to a numba kernel specialized for that length,
+    everything else falls back to the SIMD numpy dot/norm path.
+    """
+    a = np.ascontiguousarray(a, dtype=_F32)
+    b = np.ascontiguousarray(b, dtype=_F32)
+    if a.shape != b.shape:
         return 0.0
-    
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = sum(x * x for x in a) ** 0.5
-    norm_b = sum(x * x for x in b) ** 0.5
-    
+
+    if a.ndim == 1:
+        kernel = _COS_KERNELS.get(a.shape[0])
+        if kernel is not None:
+            return float(kernel(a, b))
+
+    norm_a = np.linalg.norm(a)
+    norm_b = np.linalg.norm(b)
+
     if norm_a == 0 or norm_b == 0:
         return 0.0
-    
-    return dot / (norm_a * norm_b)
+
+    return float(np.dot(a, b) / (norm_a * norm_b))
+
+
+def cosine_similarity_batch(queries: np.ndarray, docs: np.ndarray) -> np.ndarray:
+    """Cosine similarity for every (query, doc) pair as one matrix product.
+
+    Returns a float32 matrix of shape (n_queries, n_docs). Zero-norm rows
+    score 0.0 against everything, matching cosine_similarity.
+    """
+    queries = np.ascontiguousarray(queries, dtype=_F32)
+    docs = np.ascontiguousarray(docs, dtype=_F32)
+    if queries.ndim == 1:
+        queries = queries.reshape(1, -1)
+    if docs.ndim == 1:
+        docs = docs.reshape(1, -1)
+
+    q_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+    d_norms = np.linalg.norm(docs, axis=1, keepdims=True)
+    # Avoid divide-by-zero; the zero rows end up scoring 0.0 anyway
+    np.maximum(q_norms, np.finfo(_F32).tiny, out=q_norms)
+    np.maximum(d_norms, np.finfo(_F32).tiny, out=d_norms)
+
+    return (queries / q_norms) @ (docs / d_norms).T
 
 
 def get_time_ms() -> float:
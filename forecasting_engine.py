@@ -1,13 +1,15 @@
 import os
 import numpy as np
-import pickle
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 
 try:
     import lightgbm as lgb
     from xgboost import XGBRegressor
     from tensorflow.keras.models import load_model
+    import joblib
 except ImportError as e:
     print(f"CRITICAL: Missing library {e}. Cannot run real forecast.")
     sys.exit(1)
@@ -20,67 +22,122 @@ class ForecastResult:
     confidence_score: float
 
 
+class MinMaxParams:
+    """Min-max transform rebuilt from the two floats training persists.
+
+    Drop-in for the sklearn MinMaxScaler the old scaler.pkl contained.
+    """
+
+    def __init__(self, mn: float, mx: float):
+        self._min = np.float32(mn)
+        self._span = np.float32(mx - mn) or np.float32(1)
+
+    def transform(self, a):
+        return (np.asarray(a, dtype=np.float32) - self._min) / self._span
+
+    def inverse_transform(self, a):
+        return np.asarray(a, dtype=np.float32) * self._span + self._min
+
+
+def _load_scaler_params(path):
+    obj = joblib.load(path)
+    if isinstance(obj, dict):
+        return MinMaxParams(obj['min'], obj['max'])
+    return obj  # legacy pickled MinMaxScaler
+
+
 class HybridForecastingEngine:
     def __init__(self, model_dir="./models"):
         self.model_dir = model_dir
         self._load_models()
 
+    REQUIRED_FILES = ("sarima_model.pkl", "lstm_model.keras", "scaler.pkl",
+                      "xgb_model.ubj", "lgbm_model.txt")
+
     def _load_models(self):
         print("[System] Loading Real Forecasting Models...")
 
-        required_files = ["sarima_model.pkl", "lstm_model.keras", "scaler.pkl", "xgb_model.json", "lgbm_model.txt"]
-        for f in required_files:
-            if not os.path.exists(os.path.join(self.model_dir, f)):
-                print(f"FATAL: Model file missing: {f}")
-                print("Run 'train_models.py' first.")
-                sys.exit(1)
+        # One directory scan instead of a stat syscall per file - and the
+        # error names every missing file at once
+        try:
+            present = {entry.name for entry in os.scandir(self.model_dir)}
+        except FileNotFoundError:
+            present = set()
+        missing = [f for f in self.REQUIRED_FILES if f not in present]
+        if missing:
+            print(f"FATAL: Model files missing: {', '.join(missing)}")
+            print("Run 'train_models.py' first.")
+            sys.exit(1)
 
         try:
-            with open(f"{self.model_dir}/sarima_model.pkl", "rb") as f:
-                self.sarima = pickle.load(f)
+            # Keep TF from spawning its own op-level thread army; the
+            # ensemble pool already runs the models side by side
+            import tensorflow as tf
+            tf.config.threading.set_inter_op_parallelism_threads(1)
+        except Exception:
+            pass  # too late to change once the TF runtime is initialized
+
+        mdir = Path(self.model_dir)
+        try:
+            # joblib.load reads both the compressed dumps train writes
+            # now and plain pickles from older runs
+            self.sarima = joblib.load(mdir / "sarima_model.pkl")
 
-            self.lstm = load_model(f"{self.model_dir}/lstm_model.keras")
-            with open(f"{self.model_dir}/scaler.pkl", "rb") as f:
-                self.scaler = pickle.load(f)
+            self.lstm = load_model(mdir / "lstm_model.keras")
+            self.scaler = _load_scaler_params(mdir / "scaler.pkl")
 
             self.xgb = XGBRegressor()
-            self.xgb.load_model(f"{self.model_dir}/xgb_model.json")
+            self.xgb.load_model(str(mdir / "xgb_model.ubj"))
 
-            self.lgbm = lgb.Booster(model_file=f"{self.model_dir}/lgbm_model.txt")
+            self.lgbm = lgb.Booster(model_file=str(mdir / "lgbm_model.txt"))
             print("All binary models loaded successfully.")
 
         except Exception as e:
             print(f"FATAL: Corrupt model file. {e}")
             sys.exit(1)
 
-    def generate_forecast(self, recent_data):
-        results = {}
+    def _predict_sarima(self):
+        return float(self.sarima.forecast(steps=1)[0])
 
-        # SARIMA
-        try:
-            pred = self.sarima.forecast(steps=1)
-            results["SARIMA"] = float(pred[0])
-        except:
-            results["SARIMA"] = 0
+    def _predict_lstm(self, recent_data):
+        last_5 = recent_data[-5:].reshape(-1, 1)
+        scaled = self.scaler.transform(last_5).reshape(1, 5, 1)
+        pred_scaled = self.lstm.predict(scaled, verbose=0)
+        pred = self.scaler.inverse_transform(pred_scaled)
+        return float(pred[0][0])
 
-        # LSTM
-        try:
-            last_5 = recent_data[-5:].reshape(-1, 1)
-            scaled = self.scaler.transform(last_5).reshape(1, 5, 1)
-            pred_scaled = self.lstm.predict(scaled, verbose=0)
-            pred = self.scaler.inverse_transform(pred_scaled)
-            results["LSTM"] = float(pred[0][0])
-        except:
-            results["LSTM"] = 0
+    def _predict_xgb(self, recent_data):
+        features = recent_data[-5:].reshape(1, -1)
+        return float(self.xgb.predict(features)[0])
 
-        # XGBoost & LightGBM
-        try:
-            features = recent_data[-5:].reshape(1, -1)
-            results["XGBoost"] = float(self.xgb.predict(features)[0])
-            results["LightGBM"] = float(self.lgbm.predict(features)[0])
-        except:
-            pass
+    def _predict_lgbm(self, recent_data):
+        features = recent_data[-5:].reshape(1, -1)
+        return float(self.lgbm.predict(features)[0])
+
+    def generate_forecast(self, recent_data):
+        # The four models are independent and each spends its time in
+        # GIL-releasing native code (statsmodels/TF/XGBoost/LightGBM), so
+        # running them on a thread pool costs max(t_i) instead of sum(t_i)
+        tasks = {
+            "SARIMA": self._predict_sarima,
+            "LSTM": lambda: self._predict_lstm(recent_data),
+            "XGBoost": lambda: self._predict_xgb(recent_data),
+            "LightGBM": lambda: self._predict_lgbm(recent_data),
+        }
 
+        results = {}
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {name: executor.submit(fn) for name, fn in tasks.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except:
+                    results[name] = 0
+
+        return self._assemble_result(results)
+
+    @staticmethod
+    def _assemble_result(results):
         valid_preds = [v for v in results.values() if v > 0]
         if not valid_preds:
             return ForecastResult(0.0, results, 0.0)
@@ -89,4 +146,52 @@ class HybridForecastingEngine:
         std_dev = np.std(valid_preds)
         conf = max(0, 100 - (std_dev / final_pred * 200))
 
-        return ForecastResult(final_pred, results, conf)
\ No newline at end of file
+        return ForecastResult(final_pred, results, conf)
+
+    def generate_forecast_batch(self, recent_data_batch):
+        """Forecast B windows in one pass per model.
+
+        Per-window calls pay the Python/TF dispatch overhead B times with
+        batch_size=1; stacking the windows amortizes it into one LSTM
+        predict and one XGB/LGBM predict each. SARIMA has no exogenous
+        batch predict, so its single next-step forecast is shared across
+        rows (every window comes from the same fitted series).
+        """
+        batch = np.asarray(recent_data_batch, dtype=np.float64)
+        b = batch.shape[0]
+        if b == 0:
+            return []
+
+        try:
+            sarima_pred = self._predict_sarima()
+        except:
+            sarima_pred = 0
+
+        last_5 = batch[:, -5:]
+
+        try:
+            scaled = self.scaler.transform(last_5.reshape(-1, 1)).reshape(-1, 5, 1)
+            pred_scaled = self.lstm.predict(scaled, verbose=0, batch_size=b)
+            lstm_pred = self.scaler.inverse_transform(pred_scaled)[:, 0]
+        except:
+            lstm_pred = np.zeros(b)
+
+        try:
+            xgb_pred = self.xgb.predict(last_5)
+        except:
+            xgb_pred = np.zeros(b)
+
+        try:
+            lgbm_pred = self.lgbm.predict(last_5)
+        except:
+            lgbm_pred = np.zeros(b)
+
+        return [
+            self._assemble_result({
+                "SARIMA": sarima_pred,
+                "LSTM": float(lstm_pred[i]),
+                "XGBoost": float(xgb_pred[i]),
+                "LightGBM": float(lgbm_pred[i]),
+            })
+            for i in range(b)
+        ]
\ No newline at end of file
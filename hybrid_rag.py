@@ -23,13 +23,23 @@ class HybridLlmEngine:
                 model_path=model_path,
                 n_ctx=4096,
                 n_gpu_layers=-1,
+                # Physical cores only (SMT siblings fight over the ALUs)
+                # and a large prompt-eval batch for CPU fallback runs
+                n_threads=max((os.cpu_count() or 2) // 2, 1),
+                n_batch=512,
                 verbose=False
             )
         except Exception as e:
             print(f"FATAL: Failed to load GGUF model. {e}")
             sys.exit(1)
 
-    def generate_explanation(self, forecast_result, context_docs):
+    def generate_explanation(self, forecast_result, context_docs, stream=False):
+        """Explain a forecast against retrieved context.
+
+        With stream=True this returns a generator of text chunks so the
+        caller shows first tokens at prompt-eval latency (~100ms) instead
+        of blocking for the full completion, and can abort early.
+        """
         prompt = f"""[INST] You are a sales analyst.
 
         FORECAST DATA:
@@ -44,6 +54,15 @@ class HybridLlmEngine:
         [/INST]
         """
 
+        if stream:
+            return (chunk['choices'][0]['text'] for chunk in self.model(
+                prompt,
+                max_tokens=512,
+                stop=["[/INST]"],
+                temperature=0.7,
+                stream=True
+            ))
+
         output = self.model(
             prompt,
             max_tokens=512,
@@ -0,0 +1,436 @@
+"""
+ChronoForge RAG - Knowledge Base
+
+Columnar (structure-of-arrays) scenario store: one NumPy array per
+numeric field, dictionary-coded region/category columns, and one
+contiguous float32 embedding matrix. Filters run as vectorized boolean
+masks at memory bandwidth and similarity search scores the matrix with
+a single BLAS product; SalesScenario objects are only rehydrated for
+the final top-k rows.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import json
+import os
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from chronoforge_rag import (
+    IKnowledgeBase, SalesScenario, RAGQuery, RetrievalResult,
+    EmbeddingConfig, VectorStoreConfig, format_scenario_for_prompt
+)
+from embedding_engine import IEmbeddingEngine, create_embedding_engine
+
+
+def _json_dump(obj, path: str):
+    """Write JSON, via orjson (bytes, C serializer) when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f)
+
+
+def _json_load(path: str):
+    """Read JSON, via orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path) as f:
+        return json.load(f)
+
+
+def _dumps_str(obj) -> str:
+    """Serialize one object to a JSON string (for Arrow string columns)."""
+    return orjson.dumps(obj).decode() if ORJSON_AVAILABLE else json.dumps(obj)
+
+
+def _loads(data):
+    """Parse one JSON string."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+@dataclass
+class KnowledgeBaseStats:
+    """Summary statistics over the stored scenarios."""
+    total_scenarios: int = 0
+    unique_regions: int = 0
+    unique_categories: int = 0
+    min_sales_value: float = 0.0
+    max_sales_value: float = 0.0
+    avg_sales_value: float = 0.0
+    earliest_date: str = ""
+    latest_date: str = ""
+
+
+def _parse_date(date_str: str) -> np.datetime64:
+    """Parse a scenario date string, NaT when unparseable."""
+    try:
+        return np.datetime64(date_str[:10], "D")
+    except (ValueError, TypeError):
+        return np.datetime64("NaT")
+
+
+class ColumnarKnowledgeBase(IKnowledgeBase):
+    """
+    SoA knowledge base: scenario fields live in per-column buffers that
+    double in capacity (amortized O(1) appends) instead of a list of
+    Python objects, so filtering thousands of scenarios costs a few
+    vectorized masks rather than per-object attribute lookups.
+    """
+
+    def __init__(self, embedder: IEmbeddingEngine, dimension: int = None):
+        self.embedder = embedder
+        self._dim = dimension or embedder.get_dimension()
+        self._n = 0
+        self._cap = 0
+
+        # Object columns (variable-length payloads stay Python lists)
+        self.ids: List[str] = []
+        self.date_strs: List[str] = []
+        self.descriptions: List[str] = []
+        self.weather: List[str] = []
+        self.seasonality: List[str] = []
+        self.metadata: List[Dict[str, str]] = []
+        self._id_index: Dict[str, int] = {}
+        # Scenarios are immutable after ingest, so the multi-line prompt
+        # rendering is done once per scenario instead of per retrieval
+        self._prompt_cache: Dict[str, str] = {}
+
+        # Dictionary-coded categoricals
+        self.region_vocab: List[str] = []
+        self.category_vocab: List[str] = []
+        self._region_index: Dict[str, int] = {}
+        self._category_index: Dict[str, int] = {}
+
+        # Numeric columns + embedding matrix (grown together)
+        self.dates = np.empty(0, dtype="datetime64[D]")
+        self.sales = np.empty(0, dtype=np.float32)
+        self.sales_change = np.empty(0, dtype=np.float32)
+        self.predicted = np.empty(0, dtype=np.float32)
+        self.prediction_error = np.empty(0, dtype=np.float32)
+        self.region_codes = np.empty(0, dtype=np.int16)
+        self.category_codes = np.empty(0, dtype=np.int16)
+        self.had_promotion = np.empty(0, dtype=bool)
+        self.had_competitor = np.empty(0, dtype=bool)
+        self.epidemic = np.empty(0, dtype=bool)
+        self.emb = np.empty((0, self._dim), dtype=np.float32)
+
+    # -- storage management ---------------------------------------------
+
+    def _ensure_capacity(self, extra: int):
+        """Grow the numeric buffers geometrically to fit extra more rows."""
+        needed = self._n + extra
+        if needed <= self._cap:
+            return
+        new_cap = max(needed, self._cap * 2, 64)
+
+        def grow(arr: np.ndarray, shape) -> np.ndarray:
+            out = np.empty(shape, dtype=arr.dtype)
+            out[:self._n] = arr[:self._n]
+            return out
+
+        self.dates = grow(self.dates, new_cap)
+        self.sales = grow(self.sales, new_cap)
+        self.sales_change = grow(self.sales_change, new_cap)
+        self.predicted = grow(self.predicted, new_cap)
+        self.prediction_error = grow(self.prediction_error, new_cap)
+        self.region_codes = grow(self.region_codes, new_cap)
+        self.category_codes = grow(self.category_codes, new_cap)
+        self.had_promotion = grow(self.had_promotion, new_cap)
+        self.had_competitor = grow(self.had_competitor, new_cap)
+        self.epidemic = grow(self.epidemic, new_cap)
+        self.emb = grow(self.emb, (new_cap, self._dim))
+        self._cap = new_cap
+
+    def _encode(self, value: str, index: Dict[str, int], vocab: List[str]) -> int:
+        code = index.get(value)
+        if code is None:
+            code = len(vocab)
+            index[value] = code
+            vocab.append(value)
+        return code
+
+    # -- IKnowledgeBase -------------------------------------------------
+
+    def add_scenario(self, scenario: SalesScenario):
+        """Add a single scenario."""
+        self.add_scenarios([scenario])
+
+    def add_scenarios(self, scenarios: List[SalesScenario]):
+        """Add multiple scenarios (embedding any that arrive without one).
+
+        Stored embeddings are unit-normalized, so cosine similarity at
+        search time is a single matrix-vector product with no norm
+        divisions; scenario.embedding views returned by search are
+        unit-norm too.
+        """
+        if not scenarios:
+            return
+
+        # One batched pass for scenarios missing embeddings
+        missing = [s for s in scenarios if not len(s.embedding)]
+        if missing:
+            vectors = self.embedder.embed_batch([s.description for s in missing])
+            for scenario, vector in zip(missing, vectors):
+                scenario.embedding = vector
+
+        self._ensure_capacity(len(scenarios))
+        start = self._n
+        for s in scenarios:
+            i = self._n
+            self.ids.append(s.id)
+            self.date_strs.append(s.date)
+            self.descriptions.append(s.description)
+            self.weather.append(s.weather_condition)
+            self.seasonality.append(s.seasonality)
+            self.metadata.append(s.metadata)
+            self._id_index[s.id] = i
+
+            self.dates[i] = _parse_date(s.date)
+            self.sales[i] = s.sales_value
+            self.sales_change[i] = s.sales_change_pct
+            self.predicted[i] = s.predicted_value
+            self.prediction_error[i] = s.prediction_error
+            self.region_codes[i] = self._encode(s.region, self._region_index,
+                                                self.region_vocab)
+            self.category_codes[i] = self._encode(s.category, self._category_index,
+                                                  self.category_vocab)
+            self.had_promotion[i] = s.had_promotion
+            self.had_competitor[i] = s.had_competitor_action
+            self.epidemic[i] = s.epidemic_flag
+            self.emb[i] = np.asarray(s.embedding, dtype=np.float32)
+            self._prompt_cache[s.id] = format_scenario_for_prompt(s)
+            self._n += 1
+
+        # Normalize the new rows in one vectorized pass
+        block = self.emb[start:self._n]
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.maximum(norms, np.finfo(np.float32).tiny)
+
+    def _rehydrate(self, i: int) -> SalesScenario:
+        """Build a SalesScenario object from row i of the columns."""
+        return SalesScenario(
+            id=self.ids[i],
+            date=self.date_strs[i],
+            description=self.descriptions[i],
+            sales_value=float(self.sales[i]),
+            sales_change_pct=float(self.sales_change[i]),
+            predicted_value=float(self.predicted[i]),
+            prediction_error=float(self.prediction_error[i]),
+            region=self.region_vocab[self.region_codes[i]],
+            category=self.category_vocab[self.category_codes[i]],
+            had_promotion=bool(self.had_promotion[i]),
+            had_competitor_action=bool(self.had_competitor[i]),
+            weather_condition=self.weather[i],
+            seasonality=self.seasonality[i],
+            epidemic_flag=bool(self.epidemic[i]),
+            embedding=self.emb[i],
+            metadata=self.metadata[i]
+        )
+
+    def get_scenario(self, id: str) -> Optional[SalesScenario]:
+        """Get scenario by ID."""
+        i = self._id_index.get(id)
+        return self._rehydrate(i) if i is not None else None
+
+    def get_prompt_text(self, id: str) -> str:
+        """Pre-rendered prompt block for a scenario (see format_scenario_for_prompt).
+
+        Rendered at ingest; scenarios that arrived via load() render
+        lazily on first use and are cached from then on.
+        """
+        text = self._prompt_cache.get(id)
+        if text is None:
+            i = self._id_index.get(id)
+            if i is None:
+                return ""
+            text = format_scenario_for_prompt(self._rehydrate(i))
+            self._prompt_cache[id] = text
+        return text
+
+    def _filter_mask(self, query: RAGQuery) -> Optional[np.ndarray]:
+        """Vectorized filter predicates; None means no rows can match."""
+        mask = np.ones(self._n, dtype=bool)
+
+        if query.region_filter:
+            code = self._region_index.get(query.region_filter)
+            if code is None:
+                return None
+            mask &= self.region_codes[:self._n] == code
+        if query.category_filter:
+            code = self._category_index.get(query.category_filter)
+            if code is None:
+                return None
+            mask &= self.category_codes[:self._n] == code
+        if query.date_from:
+            mask &= self.dates[:self._n] >= _parse_date(query.date_from)
+        if query.date_to:
+            mask &= self.dates[:self._n] <= _parse_date(query.date_to)
+
+        return mask
+
+    def search(self, query: RAGQuery) -> List[RetrievalResult]:
+        """Search for similar scenarios (filters first, then similarity)."""
+        if self._n == 0:
+            return []
+
+        mask = self._filter_mask(query)
+        if mask is None:
+            return []
+        candidates = np.nonzero(mask)[0]
+        if candidates.size == 0:
+            return []
+
+        # Stored rows are unit-norm, so normalizing the query once turns
+        # cosine similarity into a single matrix-vector product
+        q_emb = np.asarray(self.embedder.embed(query.query_text), dtype=np.float32)
+        q_norm = np.linalg.norm(q_emb)
+        if q_norm > 0:
+            q_emb = q_emb / q_norm
+        sims = self.emb[candidates] @ q_emb
+
+        k = min(query.top_k, candidates.size)
+        top = np.argpartition(sims, -k)[-k:]
+        top = top[np.argsort(sims[top])[::-1]]
+
+        return [
+            RetrievalResult(scenario=self._rehydrate(int(candidates[j])),
+                            similarity_score=float(sims[j]),
+                            rank=rank)
+            for rank, j in enumerate(top)
+        ]
+
+    def save(self, path: str):
+        """Save knowledge base.
+
+        The embedding matrix goes to its own .npy so load() can memory-map
+        it; string columns go to an Arrow IPC file when pyarrow is
+        available (binary, no per-row JSON parsing on reload), with JSON
+        as the dependency-free fallback.
+        """
+        os.makedirs(path, exist_ok=True)
+        n = self._n
+        np.save(os.path.join(path, "emb.npy"), self.emb[:n])
+        np.savez(
+            os.path.join(path, "columns.npz"),
+            dates=self.dates[:n],
+            sales=self.sales[:n],
+            sales_change=self.sales_change[:n],
+            predicted=self.predicted[:n],
+            prediction_error=self.prediction_error[:n],
+            region_codes=self.region_codes[:n],
+            category_codes=self.category_codes[:n],
+            had_promotion=self.had_promotion[:n],
+            had_competitor=self.had_competitor[:n],
+            epidemic=self.epidemic[:n]
+        )
+        _json_dump({
+            "region_vocab": self.region_vocab,
+            "category_vocab": self.category_vocab
+        }, os.path.join(path, "vocab.json"))
+
+        strings = {
+            "ids": self.ids,
+            "date_strs": self.date_strs,
+            "descriptions": self.descriptions,
+            "weather": self.weather,
+            "seasonality": self.seasonality,
+            "metadata_json": [_dumps_str(m) for m in self.metadata]
+        }
+        if PYARROW_AVAILABLE:
+            table = pa.table(strings)
+            with pa.OSFile(os.path.join(path, "scenarios.arrow"), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        else:
+            _json_dump(strings, os.path.join(path, "scenarios.json"))
+
+    def load(self, path: str):
+        """Load knowledge base.
+
+        The embedding matrix is memory-mapped rather than read into RAM -
+        cold starts touch only the pages the first searches actually hit.
+        The matrix copies back to a private buffer if scenarios are added
+        later (capacity growth always reallocates).
+        """
+        arrow_path = os.path.join(path, "scenarios.arrow")
+        if PYARROW_AVAILABLE and os.path.exists(arrow_path):
+            with pa.OSFile(arrow_path, "rb") as source:
+                table = pa.ipc.open_file(source).read_all()
+            strings = {name: table[name].to_pylist() for name in table.column_names}
+        else:
+            strings = _json_load(os.path.join(path, "scenarios.json"))
+
+        self.ids = strings["ids"]
+        self.date_strs = strings["date_strs"]
+        self.descriptions = strings["descriptions"]
+        self.weather = strings["weather"]
+        self.seasonality = strings["seasonality"]
+        self.metadata = [_loads(m) for m in strings["metadata_json"]]
+        self._id_index = {id: i for i, id in enumerate(self.ids)}
+        self._prompt_cache = {}
+
+        vocab = _json_load(os.path.join(path, "vocab.json"))
+        self.region_vocab = vocab["region_vocab"]
+        self.category_vocab = vocab["category_vocab"]
+        self._region_index = {r: i for i, r in enumerate(self.region_vocab)}
+        self._category_index = {c: i for i, c in enumerate(self.category_vocab)}
+
+        columns = np.load(os.path.join(path, "columns.npz"))
+        self.dates = columns["dates"]
+        self.sales = columns["sales"]
+        self.sales_change = columns["sales_change"]
+        self.predicted = columns["predicted"]
+        self.prediction_error = columns["prediction_error"]
+        self.region_codes = columns["region_codes"]
+        self.category_codes = columns["category_codes"]
+        self.had_promotion = columns["had_promotion"]
+        self.had_competitor = columns["had_competitor"]
+        self.epidemic = columns["epidemic"]
+        self.emb = np.load(os.path.join(path, "emb.npy"), mmap_mode="r")
+        self._n = self._cap = len(self.ids)
+
+    def size(self) -> int:
+        """Get number of scenarios."""
+        return self._n
+
+    def get_statistics(self) -> KnowledgeBaseStats:
+        """Summary statistics over the stored scenarios."""
+        if self._n == 0:
+            return KnowledgeBaseStats()
+
+        sales = self.sales[:self._n]
+        dates = self.dates[:self._n]
+        valid_dates = dates[~np.isnat(dates)]
+        return KnowledgeBaseStats(
+            total_scenarios=self._n,
+            unique_regions=len(self.region_vocab),
+            unique_categories=len(self.category_vocab),
+            min_sales_value=float(sales.min()),
+            max_sales_value=float(sales.max()),
+            avg_sales_value=float(sales.mean()),
+            earliest_date=str(valid_dates.min()) if valid_dates.size else "",
+            latest_date=str(valid_dates.max()) if valid_dates.size else ""
+        )
+
+
+def create_knowledge_base(embed_config: EmbeddingConfig,
+                          vs_config: VectorStoreConfig) -> ColumnarKnowledgeBase:
+    """Factory: columnar knowledge base over the configured embedder."""
+    embedder = create_embedding_engine(embed_config)
+    return ColumnarKnowledgeBase(embedder, dimension=vs_config.dimension)
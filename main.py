@@ -1,6 +1,7 @@
 import sys
 import os
 import argparse
+import logging
 import numpy as np
 import pandas as pd
 
@@ -9,6 +10,8 @@ from rag_pipeline import RAGPipelineBuilder
 from forecasting_engine import HybridForecastingEngine
 from hybrid_rag import HybridLlmEngine
 
+logger = logging.getLogger('chronoforge')
+
 
 def load_sales_data(filepath):
     if not os.path.exists(filepath):
@@ -25,9 +28,16 @@ def main():
     parser.add_argument("--kb", default="./kb")
     parser.add_argument("--data", default="sales_data.csv")
     parser.add_argument("--model", default="./models/mistral-7b-instruct.Q4_K_M.gguf")
+    parser.add_argument("--quiet", action='store_true',
+                        help="Suppress progress messages (batch/backtest runs)")
     args = parser.parse_args()
 
-    print("ChronoForge Pulse (Strict Real-Data Mode)")
+    # Progress chatter goes through a logger instead of bare prints so
+    # backtest loops can silence it wholesale with --quiet
+    logging.basicConfig(level=logging.WARNING if args.quiet else logging.INFO,
+                        format='%(message)s')
+
+    logger.info("ChronoForge Pulse (Strict Real-Data Mode)")
 
     forecaster = HybridForecastingEngine()
     llm_engine = HybridLlmEngine(model_path=args.model)
@@ -37,7 +47,7 @@ def main():
         print("Run 'build_knowledge_base.py ./kb sales_data.csv' first.")
         sys.exit(1)
 
-    print(f"[System] Loading Knowledge Base...")
+    logger.info("[System] Loading Knowledge Base...")
     pipeline_builder = RAGPipelineBuilder()
     pipeline_builder.with_llm_config(LLMConfig(provider="mock"))
 
@@ -53,30 +63,32 @@ def main():
             # Forecast
             forecast_result = None
             if any(k in query.lower() for k in ["predict", "forecast", "sales"]):
-                print("Running Real Ensemble Models...")
+                logger.info("Running Real Ensemble Models...")
                 recent_data = load_sales_data(args.data)
                 forecast_result = forecaster.generate_forecast(recent_data)
                 print(f"Prediction: ${forecast_result.prediction:,.2f}")
 
             # RAG Search
             context_docs = []
-            print("Searching Vector Database...")
+            logger.info("Searching Vector Database...")
             search_results = knowledge_base.search(RAGQuery(query_text=query))
 
             for res in search_results:
                 s = res.scenario
                 context_docs.append(f"{s.date}: {s.description} [Sales: {s.sales_value}]")
 
-            # LLM Generation
-            print("Mistral 7B Thinking...")
+            # LLM Generation (streamed: tokens print as they decode)
+            logger.info("Mistral 7B Thinking...\n")
             if forecast_result:
-                response = llm_engine.generate_explanation(forecast_result, context_docs)
+                response = llm_engine.generate_explanation(forecast_result, context_docs,
+                                                           stream=True)
+                for tok in response:
+                    print(tok, end='', flush=True)
             else:
                 prompt = f"[INST] Context: {context_docs} Question: {query} [/INST]"
-                output = llm_engine.model(prompt, max_tokens=512)
-                response = output['choices'][0]['text']
-
-            print(f"\n{response}\n")
+                for chunk in llm_engine.model(prompt, max_tokens=512, stream=True):
+                    print(chunk['choices'][0]['text'], end='', flush=True)
+            print("\n")
 
         except KeyboardInterrupt:
             break
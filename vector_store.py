@@ -0,0 +1,285 @@
+"""
+ChronoForge RAG - Vector Store
+
+Supports:
+- HNSW: usearch approximate index (O(log N) queries, SIMD distance kernels)
+- Flat: brute-force NumPy scan (exact, no extra dependencies)
+"""
+
+from typing import Any, Dict, List, Tuple
+import json
+import os
+
+import numpy as np
+
+from chronoforge_rag import IVectorStore, VectorStoreConfig
+
+try:
+    from usearch.index import Index
+    USEARCH_AVAILABLE = True
+except ImportError:
+    USEARCH_AVAILABLE = False
+
+
+class NumpyVectorStore(IVectorStore):
+    """
+    Brute-force flat store: one contiguous float32 matrix scored with a
+    single normalized matrix-vector product per query. Exact results;
+    fine up to a few thousand vectors.
+    """
+
+    def __init__(self, config: VectorStoreConfig):
+        self.config = config
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._matrix = np.empty((0, config.dimension), dtype=np.float32)
+
+    def add(self, id: str, embedding: List[float], metadata: Dict[str, Any] = None):
+        """Add a single vector."""
+        self.add_batch([id], [embedding], [metadata or {}])
+
+    def add_batch(self, ids: List[str], embeddings: List[List[float]],
+                  metadatas: List[Dict[str, Any]] = None):
+        """Add multiple vectors."""
+        if not ids:
+            return
+        rows = np.asarray(embeddings, dtype=np.float32)
+        self._matrix = np.vstack([self._matrix, rows])
+        self._ids.extend(ids)
+        self._metadatas.extend(metadatas or [{} for _ in ids])
+
+    def search(self, query: List[float], k: int) -> List[Tuple[str, float]]:
+        """Search for similar vectors. Returns (id, distance) pairs."""
+        n = len(self._ids)
+        if n == 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32)
+        q_norm = float(np.linalg.norm(q))
+        if q_norm == 0:
+            return []
+
+        norms = np.linalg.norm(self._matrix, axis=1)
+        norms[norms == 0] = np.finfo(np.float32).tiny
+        sims = (self._matrix @ q) / (norms * q_norm)
+
+        k = min(k, n)
+        # argpartition pulls the top-k in O(n), then only k entries get sorted
+        top = np.argpartition(sims, -k)[-k:]
+        top = top[np.argsort(sims[top])[::-1]]
+
+        return [(self._ids[i], float(1.0 - sims[i])) for i in top]
+
+    def save(self, path: str):
+        """Persist the vector store."""
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, f"{self.config.collection_name}.npy"), self._matrix)
+        with open(os.path.join(path, f"{self.config.collection_name}.json"), "w") as f:
+            json.dump({"ids": self._ids, "metadatas": self._metadatas}, f)
+
+    def load(self, path: str):
+        """Load from persisted storage."""
+        self._matrix = np.load(os.path.join(path, f"{self.config.collection_name}.npy"))
+        with open(os.path.join(path, f"{self.config.collection_name}.json")) as f:
+            data = json.load(f)
+        self._ids = data["ids"]
+        self._metadatas = data["metadatas"]
+
+    def size(self) -> int:
+        """Get number of vectors."""
+        return len(self._ids)
+
+
+class SQ8VectorStore(IVectorStore):
+    """
+    Scalar-quantized flat store: rows are symmetric int8 codes with one
+    float32 scale each, quartering memory and bandwidth versus fp32.
+    Cosine similarity on codes needs no de-quantization at all - the
+    per-vector scales cancel out of dot / (norm * norm) - so a scan is a
+    single int32-accumulated matrix-vector product.
+    """
+
+    def __init__(self, config: VectorStoreConfig):
+        self.config = config
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._codes = np.empty((0, config.dimension), dtype=np.int8)
+        self._scales = np.empty(0, dtype=np.float32)
+        self._code_norms = np.empty(0, dtype=np.float32)
+
+    @staticmethod
+    def _quantize(rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Symmetric per-vector int8 quantization: codes * scale ~ row."""
+        max_abs = np.max(np.abs(rows), axis=1)
+        scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+        codes = np.clip(np.round(rows / scales[:, None]), -127, 127).astype(np.int8)
+        return codes, scales
+
+    def add(self, id: str, embedding: List[float], metadata: Dict[str, Any] = None):
+        """Add a single vector."""
+        self.add_batch([id], [embedding], [metadata or {}])
+
+    def add_batch(self, ids: List[str], embeddings: List[List[float]],
+                  metadatas: List[Dict[str, Any]] = None):
+        """Add multiple vectors."""
+        if not ids:
+            return
+        codes, scales = self._quantize(np.asarray(embeddings, dtype=np.float32))
+        self._codes = np.vstack([self._codes, codes])
+        self._scales = np.concatenate([self._scales, scales])
+        self._code_norms = np.concatenate([
+            self._code_norms,
+            np.linalg.norm(codes.astype(np.float32), axis=1).astype(np.float32)
+        ])
+        self._ids.extend(ids)
+        self._metadatas.extend(metadatas or [{} for _ in ids])
+
+    def search(self, query: List[float], k: int) -> List[Tuple[str, float]]:
+        """Search for similar vectors. Returns (id, distance) pairs."""
+        n = len(self._ids)
+        if n == 0:
+            return []
+
+        q = np.asarray(query, dtype=np.float32).reshape(1, -1)
+        q_codes, _ = self._quantize(q)
+        q_codes = q_codes[0]
+        q_norm = float(np.linalg.norm(q_codes.astype(np.float32)))
+        if q_norm == 0:
+            return []
+
+        # int32 accumulation (int8 dots would overflow at d > 2)
+        dots = self._codes.astype(np.int32) @ q_codes.astype(np.int32)
+        norms = np.where(self._code_norms > 0, self._code_norms,
+                         np.finfo(np.float32).tiny)
+        sims = dots / (norms * q_norm)
+
+        k = min(k, n)
+        top = np.argpartition(sims, -k)[-k:]
+        top = top[np.argsort(sims[top])[::-1]]
+
+        return [(self._ids[i], float(1.0 - sims[i])) for i in top]
+
+    def save(self, path: str):
+        """Persist the vector store."""
+        os.makedirs(path, exist_ok=True)
+        name = self.config.collection_name
+        np.save(os.path.join(path, f"{name}.codes.npy"), self._codes)
+        np.save(os.path.join(path, f"{name}.scales.npy"), self._scales)
+        with open(os.path.join(path, f"{name}.json"), "w") as f:
+            json.dump({"ids": self._ids, "metadatas": self._metadatas}, f)
+
+    def load(self, path: str):
+        """Load from persisted storage."""
+        name = self.config.collection_name
+        self._codes = np.load(os.path.join(path, f"{name}.codes.npy"))
+        self._scales = np.load(os.path.join(path, f"{name}.scales.npy"))
+        self._code_norms = np.linalg.norm(
+            self._codes.astype(np.float32), axis=1).astype(np.float32)
+        with open(os.path.join(path, f"{name}.json")) as f:
+            data = json.load(f)
+        self._ids = data["ids"]
+        self._metadatas = data["metadatas"]
+
+    def size(self) -> int:
+        """Get number of vectors."""
+        return len(self._ids)
+
+
+class HNSWVectorStore(IVectorStore):
+    """
+    Approximate store backed by a usearch HNSW index: queries are
+    O(log N) graph walks with built-in SIMD cosine kernels instead of a
+    full-matrix scan. Recall is tunable via expansion_search.
+    """
+
+    def __init__(self, config: VectorStoreConfig):
+        if not USEARCH_AVAILABLE:
+            raise ImportError("usearch not installed. Run: pip install usearch")
+
+        self.config = config
+        self._index = Index(
+            ndim=config.dimension,
+            metric="cos",
+            dtype="f32",
+            connectivity=16,
+            expansion_add=64,
+            expansion_search=100,
+        )
+        # usearch keys are int64; keep both directions of the string-id map
+        self._id_to_key: Dict[str, int] = {}
+        self._key_to_id: Dict[int, str] = {}
+        self._metadatas: Dict[str, Dict[str, Any]] = {}
+        self._next_key = 0
+
+    def add(self, id: str, embedding: List[float], metadata: Dict[str, Any] = None):
+        """Add a single vector."""
+        self.add_batch([id], [embedding], [metadata or {}])
+
+    def add_batch(self, ids: List[str], embeddings: List[List[float]],
+                  metadatas: List[Dict[str, Any]] = None):
+        """Add multiple vectors."""
+        if not ids:
+            return
+        keys = np.arange(self._next_key, self._next_key + len(ids), dtype=np.int64)
+        self._next_key += len(ids)
+
+        for id, key in zip(ids, keys):
+            self._id_to_key[id] = int(key)
+            self._key_to_id[int(key)] = id
+        for id, metadata in zip(ids, metadatas or [{} for _ in ids]):
+            self._metadatas[id] = metadata
+
+        self._index.add(keys, np.asarray(embeddings, dtype=np.float32))
+
+    def search(self, query: List[float], k: int) -> List[Tuple[str, float]]:
+        """Search for similar vectors. Returns (id, distance) pairs."""
+        if not self._id_to_key:
+            return []
+        matches = self._index.search(np.asarray(query, dtype=np.float32), k)
+        return [(self._key_to_id[int(m.key)], float(m.distance)) for m in matches]
+
+    def save(self, path: str):
+        """Persist the vector store."""
+        os.makedirs(path, exist_ok=True)
+        self._index.save(os.path.join(path, f"{self.config.collection_name}.usearch"))
+        with open(os.path.join(path, f"{self.config.collection_name}.json"), "w") as f:
+            json.dump({
+                "id_to_key": self._id_to_key,
+                "metadatas": self._metadatas,
+                "next_key": self._next_key
+            }, f)
+
+    def load(self, path: str):
+        """Load from persisted storage."""
+        self._index.load(os.path.join(path, f"{self.config.collection_name}.usearch"))
+        with open(os.path.join(path, f"{self.config.collection_name}.json")) as f:
+            data = json.load(f)
+        self._id_to_key = data["id_to_key"]
+        self._key_to_id = {int(key): id for id, key in self._id_to_key.items()}
+        self._metadatas = data["metadatas"]
+        self._next_key = data["next_key"]
+
+    def size(self) -> int:
+        """Get number of vectors."""
+        return len(self._id_to_key)
+
+
+def create_vector_store(config: VectorStoreConfig) -> IVectorStore:
+    """
+    Factory function to create the appropriate vector store.
+
+    Priority:
+    1. If quantization="sq8" -> int8 scalar-quantized flat store
+    2. If usearch available -> HNSW index
+    3. Fallback to brute-force NumPy scan
+    """
+    if config.quantization == "sq8":
+        return SQ8VectorStore(config)
+    if config.quantization != "fp32":
+        raise ValueError(f"Unknown quantization: {config.quantization}")
+
+    if USEARCH_AVAILABLE:
+        return HNSWVectorStore(config)
+
+    print("Warning: usearch not available, using brute-force vector store")
+    return NumpyVectorStore(config)